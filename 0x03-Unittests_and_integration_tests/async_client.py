@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Concurrent fetching of many github orgs with asyncio
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from client import GithubOrgClient
+from utils import ensure_pool_maxsize, get_json_page
+
+
+class OrgResult(NamedTuple):
+    """Outcome of fetching one org"""
+    org_name: str
+    org: Optional[Dict]
+    repos: Optional[List[Dict]]
+    error: Optional[BaseException]
+
+
+class HostRateLimiter:
+    """Token bucket per host: rate requests/second, bursts up to burst.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """Init method of HostRateLimiter"""
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, host: str) -> None:
+        """Wait until a request to host is allowed"""
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            await asyncio.sleep(wait)
+
+
+class AsyncGithubOrgClient:
+    """Fetch org and repos payloads for many orgs concurrently.
+    Requests run on a thread pool through the shared utils session, so
+    they share its keep-alive connection pool, which is grown on enter
+    to hold concurrency connections per host. At most concurrency
+    requests are in flight, and with rate_per_host set each host is
+    limited to that many requests per second.
+    """
+    ORG_URL = GithubOrgClient.ORG_URL
+
+    def __init__(self, concurrency: int = 20,
+                 rate_per_host: Optional[float] = None,
+                 burst: Optional[int] = None) -> None:
+        """Init method of AsyncGithubOrgClient"""
+        self.concurrency = concurrency
+        self._limiter = HostRateLimiter(rate_per_host, burst) \
+            if rate_per_host else None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> "AsyncGithubOrgClient":
+        ensure_pool_maxsize(self.concurrency)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def get_json_page(self, url: str) -> Any:
+        """Fetch one page within the concurrency and rate limits"""
+        async with self._semaphore:
+            if self._limiter is not None:
+                await self._limiter.acquire(urlsplit(url).netloc)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, get_json_page, url)
+
+    async def fetch_org(self, org_name: str) -> OrgResult:
+        """Fetch org payload and every page of its repos"""
+        try:
+            org, _ = await self.get_json_page(
+                self.ORG_URL.format(org=org_name))
+            repos: List[Dict] = []
+            url = org["repos_url"]
+            while url:
+                page, url = await self.get_json_page(url)
+                repos.extend(page)
+        except Exception as e:
+            return OrgResult(org_name, None, None, e)
+        return OrgResult(org_name, org, repos, None)
+
+    async def fetch_orgs(
+        self, org_names: Iterable[str]
+    ) -> AsyncIterator[OrgResult]:
+        """Yield an OrgResult per org as soon as it completes"""
+        tasks = [asyncio.ensure_future(self.fetch_org(name))
+                 for name in org_names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def fetch_orgs(org_names: Iterable[str],
+                     **kwargs: Any) -> Dict[str, OrgResult]:
+    """Fetch all org_names concurrently and return results by org name"""
+    results = {}
+    async with AsyncGithubOrgClient(**kwargs) as client:
+        async for result in client.fetch_orgs(org_names):
+            results[result.org_name] = result
+    return results
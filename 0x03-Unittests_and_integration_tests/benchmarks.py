@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Benchmarks for the github org client, run against a local stub server.
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+
+import requests
+
+import utils
+from async_client import AsyncGithubOrgClient
+from client import GithubOrgClient, ReposPayload
+from replay import ReplayStore, mount_recording, mount_replay
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve a fixed JSON body over HTTP/1.1 keep-alive."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b"{}"
+
+    def do_GET(self) -> None:
+        """Answer every GET with the stub body"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args) -> None:
+        """Keep benchmark output quiet"""
+
+
+class StubServer:
+    """Context manager running a handler class on a free local port."""
+
+    def __init__(self, handler: type = StubHandler) -> None:
+        """Init method of StubServer"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def timed(label: str, calls: int, func: Callable[[int], object]) -> float:
+    """Run func calls times and print the per-call latency"""
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print("{:<36} {:>10.1f} us/call  ({} calls)".format(
+        label, elapsed / calls * 1e6, calls))
+    return elapsed
+
+
+def bench_session(args: argparse.Namespace) -> None:
+    """Repeated get_json calls: new connection per call vs shared session"""
+    StubHandler.body = json.dumps(
+        {"repos_url": "http://localhost/orgs/google/repos"}).encode()
+    with StubServer() as server:
+        url = server.url + "/orgs/google"
+        timed("requests.get (new connection)", args.calls,
+              lambda i: requests.get(url, timeout=utils.DEFAULT_TIMEOUT).json())
+        utils.configure_session()
+        timed("get_json (shared session)", args.calls,
+              lambda i: utils.get_json(url))
+
+
+class FakeGithubHandler(StubHandler):
+    """Answer /orgs/<name> and /orgs/<name>/repos after a fixed latency."""
+    latency = 0.02
+    requests_served = 0
+
+    def do_GET(self) -> None:
+        """Serve an org or its repos listing"""
+        type(self).requests_served += 1
+        time.sleep(self.latency)
+        host, port = self.server.server_address[:2]
+        if self.path.endswith("/repos"):
+            payload = [{"name": "repo{}".format(i), "license": None}
+                       for i in range(30)]
+        else:
+            payload = {"repos_url": "http://{}:{}{}/repos".format(
+                host, port, self.path)}
+        self.body = json.dumps(payload).encode()
+        super().do_GET()
+
+
+def bench_multi_org(args: argparse.Namespace) -> None:
+    """Fetch org + repos for many orgs: sequential vs asyncio"""
+    FakeGithubHandler.latency = args.latency
+    orgs = ["org{}".format(i) for i in range(args.orgs)]
+    with StubServer(FakeGithubHandler) as server:
+        org_url = server.url + "/orgs/{org}"
+
+        class LocalClient(GithubOrgClient):
+            ORG_URL = org_url
+
+        class LocalAsyncClient(AsyncGithubOrgClient):
+            ORG_URL = org_url
+
+        utils.configure_session(pool_maxsize=max(args.concurrency))
+        start = time.perf_counter()
+        for org in orgs:
+            LocalClient(org).repos_payload
+        baseline = time.perf_counter() - start
+        print("{:<24} {:>8.3f}s".format("sequential", baseline))
+
+        async def run(concurrency: int) -> int:
+            done = 0
+            async with LocalAsyncClient(concurrency=concurrency) as client:
+                async for result in client.fetch_orgs(orgs):
+                    done += result.error is None
+            return done
+
+        for concurrency in args.concurrency:
+            start = time.perf_counter()
+            done = asyncio.run(run(concurrency))
+            elapsed = time.perf_counter() - start
+            print("{:<24} {:>8.3f}s  speedup x{:.1f}  ({}/{} ok)".format(
+                "asyncio c={}".format(concurrency), elapsed,
+                baseline / elapsed, done, len(orgs)))
+
+
+def bench_shared_memo(args: argparse.Namespace) -> None:
+    """Outbound calls for a skewed request mix, per-instance vs shared"""
+    FakeGithubHandler.latency = args.latency
+    rng = random.Random(1)
+    orgs = ["org{}".format(i) for i in range(args.orgs)]
+    weights = [1 / (rank + 1) for rank in range(len(orgs))]
+    mix = rng.choices(orgs, weights=weights, k=args.calls)
+    with StubServer(FakeGithubHandler) as server:
+
+        class LocalClient(GithubOrgClient):
+            ORG_URL = server.url + "/orgs/{org}"
+
+        for label, shared in (("per instance", False), ("shared", True)):
+            GithubOrgClient.org.cache_clear()
+            GithubOrgClient.repos_payload.cache_clear()
+            FakeGithubHandler.requests_served = 0
+            start = time.perf_counter()
+            for org in mix:
+                if not shared:
+                    GithubOrgClient.org.cache_clear()
+                    GithubOrgClient.repos_payload.cache_clear()
+                LocalClient(org).public_repos()
+            elapsed = time.perf_counter() - start
+            print("{:<16} {:>6} outbound calls for {} requests  {:>8.3f}s"
+                  .format(label, FakeGithubHandler.requests_served,
+                          len(mix), elapsed))
+
+
+def bench_license_index(args: argparse.Namespace) -> None:
+    """License queries over a synthetic payload: rescan vs license index"""
+    rng = random.Random(1)
+    licenses = ["license{}".format(i) for i in range(20)]
+    payload = [{"name": "repo{}".format(i),
+                "license": rng.choice([None] + [{"key": key}
+                                                for key in licenses])}
+               for i in range(args.repos)]
+
+    def scan(i: int) -> list:
+        key = licenses[i % len(licenses)]
+        return [repo["name"] for repo in payload
+                if GithubOrgClient.has_license(repo, key)]
+
+    indexed = ReposPayload(payload)
+    timed("rescan with has_license", args.calls, scan)
+    timed("license index (incl. build)", args.calls,
+          lambda i: list(indexed.license_index.get(
+              licenses[i % len(licenses)], ())))
+
+
+def bench_nested_map(args: argparse.Namespace) -> None:
+    """Read ("license", "key") from every repo: per-call vs compiled"""
+    rng = random.Random(1)
+    repos = [{"name": "repo{}".format(i),
+              "license": rng.choice([{"key": "mit"}, {"key": "bsd"}])}
+             for i in range(args.repos)]
+    path = ("license", "key")
+    license_key = utils.compile_path(path)
+    timed("access_nested_map per repo", args.calls,
+          lambda i: [utils.access_nested_map(repo, path) for repo in repos])
+    timed("compile_path accessor per repo", args.calls,
+          lambda i: [license_key(repo) for repo in repos])
+    timed("access_nested_maps (bulk)", args.calls,
+          lambda i: utils.access_nested_maps(repos, path))
+
+
+def synthetic_repo(i: int) -> Dict:
+    """A repo dict shaped (and sized) like a GitHub API listing entry"""
+    owner = {"login": "org", "id": 1, "type": "Organization",
+             "site_admin": False}
+    owner.update(("{}_url".format(name), "https://api.github.com/x/" + name)
+                 for name in ("avatar", "html", "followers", "repos",
+                              "events", "gists", "starred", "orgs"))
+    repo = {"id": i, "name": "repo{}".format(i), "private": False,
+            "owner": owner, "description": "A repository " * 8,
+            "fork": False, "size": i * 7, "stargazers_count": i % 97,
+            "license": {"key": "mit", "name": "MIT License",
+                        "spdx_id": "MIT"} if i % 3 else None,
+            "topics": ["topic{}".format(t) for t in range(5)]}
+    repo.update(("{}_url".format(name), "https://api.github.com/repos/x/"
+                 + name) for name in ("html", "git", "ssh", "clone",
+                                      "issues", "pulls", "commits",
+                                      "branches", "tags", "releases",
+                                      "contents", "compare", "merges"))
+    return repo
+
+
+def bench_json_decode(args: argparse.Namespace) -> None:
+    """Decode a large repos listing: stdlib, orjson, streamed projection"""
+    body = json.dumps([synthetic_repo(i) for i in range(args.repos)])
+    StubHandler.body = body.encode()
+    fields = [("name",), ("license", "key")]
+    print("payload {:.1f} MiB, {} repos".format(
+        len(StubHandler.body) / 2 ** 20, args.repos))
+    with StubServer() as server:
+        url = server.url + "/repos"
+        runs = [("response.json()", None, None)]
+        if utils.orjson is not None:
+            runs.append(("orjson", utils.orjson.loads, None))
+        runs.append(("fields, streamed", None, fields))
+        for label, loads, projection in runs:
+            utils.configure_json(loads)
+            utils.get_json(url, fields=projection)
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                utils.get_json(url, fields=projection)
+            elapsed = time.perf_counter() - start
+            # separate pass: tracemalloc would distort the timing above
+            tracemalloc.start()
+            utils.get_json(url, fields=projection)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print("{:<20} {:>9.1f} ms/call  peak {:>7.1f} MiB".format(
+                label, elapsed / args.calls * 1e3, peak / 2 ** 20))
+        utils.configure_json(None)
+
+
+def bench_replay(args: argparse.Namespace) -> None:
+    """Record orgs from the live stub, then replay them offline"""
+    FakeGithubHandler.latency = args.latency
+    orgs = ["org{}".format(i) for i in range(args.orgs)]
+    with tempfile.TemporaryDirectory() as directory:
+        store = ReplayStore(directory)
+        with StubServer(FakeGithubHandler) as server:
+
+            class LocalClient(GithubOrgClient):
+                ORG_URL = server.url + "/orgs/{org}"
+
+            utils.configure_session()
+            mount_recording(store)
+            GithubOrgClient.org.cache_clear()
+            GithubOrgClient.repos_payload.cache_clear()
+            start = time.perf_counter()
+            live = [LocalClient(org).public_repos() for org in orgs]
+            print("{:<28} {:>8.3f}s".format(
+                "live (recording)", time.perf_counter() - start))
+
+        # the stub server is gone: everything below is served from disk
+        for label, jitter in (("replay", 0.0), ("replay, jitter 0.5", 0.5),
+                              ("replay, jitter 0.5 again", 0.5)):
+            utils.configure_session()
+            adapter = mount_replay(store, latency=args.latency,
+                                   jitter=jitter, seed=1)
+            GithubOrgClient.org.cache_clear()
+            GithubOrgClient.repos_payload.cache_clear()
+            start = time.perf_counter()
+            replayed = [LocalClient(org).public_repos() for org in orgs]
+            print("{:<28} {:>8.3f}s  {} requests, identical: {}".format(
+                label, time.perf_counter() - start,
+                adapter.requests_served, replayed == live))
+        utils.configure_session()
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], None]] = {
+    "json-decode": bench_json_decode,
+    "license-index": bench_license_index,
+    "multi-org": bench_multi_org,
+    "nested-map": bench_nested_map,
+    "replay": bench_replay,
+    "shared-memo": bench_shared_memo,
+    "session": bench_session,
+}
+
+
+def main() -> None:
+    """Run the benchmark named on the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--repos", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[10, 50])
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,66 @@
 #!/usr/bin/env python3
 """A github org client
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
+    Iterator,
     List,
     Dict,
+    Optional,
+    Tuple,
 )
 
 from utils import (
     get_json,
-    access_nested_map,
+    get_json_page,
+    access_nested_maps,
+    compile_path,
     memoize,
+    shared_memoize,
 )
 
+LICENSE_KEY_PATH = ("license", "key")
+_license_key = compile_path(LICENSE_KEY_PATH)
+
+
+class ReposPayload(list):
+    """List of repo dicts that indexes repo names by license key.
+    The index is built on first use and lives as long as the payload,
+    so it is shared and expired together with the memoized payload.
+    """
+
+    @memoize
+    def license_index(self) -> Dict[str, List[str]]:
+        """Repo names per license key, in payload order"""
+        index: Dict[str, List[str]] = {}
+        keys = access_nested_maps(self, LICENSE_KEY_PATH, default=None)
+        for repo, key in zip(self, keys):
+            if key is not None:
+                index.setdefault(key, []).append(repo["name"])
+        return index
+
 
 class GithubOrgClient:
     """A Githib org client
     """
     ORG_URL = "https://api.github.com/orgs/{org}"
+    CACHE_SIZE = 256
+    CACHE_TTL = 300
+    # Key paths kept from each repo; None keeps whole repo dicts.
+    # (("name",), LICENSE_KEY_PATH) is all public_repos needs.
+    REPOS_FIELDS: Optional[Tuple[Tuple[str, ...], ...]] = None
 
     def __init__(self, org_name: str) -> None:
         """Init method of GithubOrgClient"""
         self._org_name = org_name
 
-    @memoize
+    def _cache_key(self) -> Tuple:
+        """Key under which payloads are shared between instances"""
+        return self.ORG_URL, self._org_name, self.REPOS_FIELDS
+
+    @shared_memoize(key=_cache_key, maxsize=CACHE_SIZE, ttl=CACHE_TTL)
     def org(self) -> Dict:
-        """Memoize org"""
+        """Memoize org, shared per org"""
         return get_json(self.ORG_URL.format(org=self._org_name))
 
     @property
@@ -32,14 +68,49 @@ class GithubOrgClient:
         """Public repos URL"""
         return self.org["repos_url"]
 
-    @memoize
-    def repos_payload(self) -> Dict:
-        """Memoize repos payload"""
-        return get_json(self._public_repos_url)
+    def _get_repos_page(self, url: str) -> Tuple[List[Dict], Optional[str]]:
+        """One page of repos, projected to REPOS_FIELDS if set"""
+        if self.REPOS_FIELDS is None:
+            return get_json_page(url)
+        return get_json_page(url, fields=self.REPOS_FIELDS)
+
+    def iter_repos(self, prefetch: bool = False) -> Iterator[Dict]:
+        """Yield repos one page at a time, following Link rel="next".
+        With prefetch, the next page is fetched in a background thread
+        while the current one is being consumed.
+        """
+        url = self._public_repos_url
+        if not prefetch:
+            while url:
+                page, url = self._get_repos_page(url)
+                yield from page
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._get_repos_page, url)
+            while future is not None:
+                page, url = future.result()
+                future = executor.submit(self._get_repos_page, url) \
+                    if url else None
+                yield from page
+
+    @shared_memoize(key=_cache_key, maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    def repos_payload(self) -> ReposPayload:
+        """Memoize repos payload (all pages), shared per org"""
+        return ReposPayload(self.iter_repos())
 
-    def public_repos(self, license: str = None) -> List[str]:
-        """Public repos"""
-        json_payload = self.repos_payload
+    def public_repos(self, license: str = None,
+                     stream: bool = False) -> List[str]:
+        """Public repos
+        With stream, pages are consumed as they arrive instead of
+        materialising (and memoizing) the whole payload first. Otherwise
+        a license filter is answered from the payload's license index.
+        """
+        if license is not None and not stream:
+            index = getattr(self.repos_payload, "license_index", None)
+            if index is not None:
+                return list(index.get(license, ()))
+        json_payload = self.iter_repos(prefetch=True) if stream \
+            else self.repos_payload
         public_repos = [
             repo["name"] for repo in json_payload
             if license is None or self.has_license(repo, license)
@@ -52,7 +123,7 @@ class GithubOrgClient:
         """Static: has_license"""
         assert license_key is not None, "license_key cannot be None"
         try:
-            has_license = access_nested_map(repo, ("license", "key")) == license_key
+            has_license = _license_key(repo) == license_key
         except KeyError:
             return False
         return has_license
\ No newline at end of file
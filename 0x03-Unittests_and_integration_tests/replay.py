@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Offline record/replay transport for get_json.
+Mount a RecordingAdapter on the shared session to save live responses,
+then a ReplayAdapter to serve them again without the network.
+"""
+import hashlib
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+import utils
+
+# Response headers worth keeping; the rest vary between runs.
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+
+class ReplayMiss(requests.exceptions.ConnectionError):
+    """No recorded response for the requested URL"""
+
+
+class ReplayStore:
+    """Directory of recorded responses, one JSON file per URL.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Init method of ReplayStore"""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        """File holding the recording for url"""
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the recording for url, or None"""
+        try:
+            with open(self._path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def save(self, url: str, body: Union[str, bytes], status: int = 200,
+             headers: Optional[Dict[str, str]] = None) -> None:
+        """Record body (and status/headers) as the response for url"""
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        entry = {
+            "url": url,
+            "status": status,
+            "headers": dict(headers or {"Content-Type": "application/json"}),
+            "body": body,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(url))
+
+    def save_json(self, url: str, payload: Any,
+                  next_url: Optional[str] = None) -> None:
+        """Record payload as a JSON response, linking to next_url"""
+        headers = {"Content-Type": "application/json"}
+        if next_url:
+            headers["Link"] = '<{}>; rel="next"'.format(next_url)
+        self.save(url, json.dumps(payload), headers=headers)
+
+
+class RecordingAdapter(BaseAdapter):
+    """Send requests through adapter and record each response.
+    """
+
+    def __init__(self, store: ReplayStore,
+                 adapter: Optional[BaseAdapter] = None) -> None:
+        """Init method of RecordingAdapter"""
+        super().__init__()
+        self.store = store
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest,
+             **kwargs: Any) -> requests.Response:
+        """Send request for real, then store the response"""
+        response = self.adapter.send(request, **kwargs)
+        if request.method == "GET" and response.status_code == 200:
+            headers = {name: response.headers[name]
+                       for name in RECORDED_HEADERS if name in response.headers}
+            self.store.save(request.url, response.content,
+                            response.status_code, headers)
+        return response
+
+    def close(self) -> None:
+        """Close the wrapped adapter"""
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve recorded responses after an injected latency.
+    Each response waits latency seconds, varied uniformly by +/- jitter
+    (a fraction of latency) from a seeded generator so runs repeat.
+    A latency above the request's read timeout raises ReadTimeout, and
+    a URL with no recording raises ReplayMiss.
+    """
+
+    def __init__(self, store: ReplayStore, latency: float = 0.0,
+                 jitter: float = 0.0, seed: Optional[int] = 0) -> None:
+        """Init method of ReplayAdapter"""
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        """Latency for the next response"""
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            spread = self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latency * (1 + spread))
+
+    def send(self, request: requests.PreparedRequest,
+             timeout: Union[None, float, Tuple[float, float]] = None,
+             **kwargs: Any) -> requests.Response:
+        """Answer request from the store"""
+        entry = self.store.get(request.url)
+        if entry is None:
+            raise ReplayMiss("no recording for {}".format(request.url),
+                             request=request)
+        delay = self._delay()
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(
+                "replayed latency exceeds timeout", request=request)
+        time.sleep(delay)
+        with self._lock:
+            self.requests_served += 1
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(entry["body"].encode("utf-8"))
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.reason = "OK" if response.status_code == 200 else ""
+        return response
+
+    def close(self) -> None:
+        """Nothing to release"""
+
+
+def _mount(adapter: BaseAdapter,
+           session: Optional[requests.Session]) -> BaseAdapter:
+    """Mount adapter for http and https on session (default: shared)"""
+    session = session or utils.get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+
+def mount_recording(store: ReplayStore,
+                    session: Optional[requests.Session] = None
+                    ) -> RecordingAdapter:
+    """Record every response fetched through session (default: the
+    shared utils session). utils.configure_session() unmounts it.
+    """
+    session = session or utils.get_session()
+    return _mount(RecordingAdapter(store, session.get_adapter("https://")),
+                  session)
+
+
+def mount_replay(store: ReplayStore,
+                 session: Optional[requests.Session] = None,
+                 **kwargs: Any) -> ReplayAdapter:
+    """Serve session's (default: the shared utils session) requests from
+    store; kwargs are passed to ReplayAdapter. utils.configure_session()
+    unmounts it.
+    """
+    return _mount(ReplayAdapter(store, **kwargs), session)
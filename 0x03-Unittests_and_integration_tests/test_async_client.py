@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Test cases for async_client module.
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import utils
+from async_client import AsyncGithubOrgClient, HostRateLimiter, fetch_orgs
+
+
+def fake_get_json_page(url):
+    """Serve a two-page repos listing for any org, failing for 'missing'."""
+    if url.endswith("/missing"):
+        raise KeyError("repos_url")
+    if "/repos" not in url:
+        return {"repos_url": url + "/repos"}, None
+    if url.endswith("?page=2"):
+        return [{"name": "b"}], None
+    return [{"name": "a"}], url + "?page=2"
+
+
+class TestAsyncGithubOrgClient(unittest.TestCase):
+    """Test cases for AsyncGithubOrgClient class."""
+
+    @patch('async_client.get_json_page', side_effect=fake_get_json_page)
+    def test_fetch_orgs(self, mock_get_json_page):
+        """Test that org and all repo pages are fetched for every org."""
+        results = asyncio.run(fetch_orgs(["google", "abc", "missing"]))
+
+        self.assertEqual(set(results), {"google", "abc", "missing"})
+        self.assertEqual(results["google"].repos, [{"name": "a"}, {"name": "b"}])
+        self.assertEqual(results["abc"].org["repos_url"],
+                         "https://api.github.com/orgs/abc/repos")
+        self.assertIsInstance(results["missing"].error, KeyError)
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than concurrency requests run at once."""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def slow_get_json_page(url):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+            return fake_get_json_page(url)
+
+        with patch('async_client.get_json_page', side_effect=slow_get_json_page):
+            asyncio.run(fetch_orgs(["org{}".format(i) for i in range(20)],
+                                   concurrency=3))
+
+        self.assertLessEqual(state["peak"], 3)
+
+    def test_enter_grows_shared_pool(self):
+        """Test that the shared session can keep concurrency connections."""
+        utils.configure_session(pool_maxsize=2)
+        try:
+            async def enter():
+                async with AsyncGithubOrgClient(concurrency=30):
+                    pass
+
+            asyncio.run(enter())
+            adapter = utils.get_session().get_adapter("https://api.github.com")
+            self.assertEqual(adapter._pool_maxsize, 30)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 30)
+        finally:
+            utils.configure_session()
+
+    def test_rate_limiter_spaces_requests_per_host(self):
+        """Test that requests beyond the burst wait for new tokens."""
+        async def run():
+            limiter = HostRateLimiter(rate=100, burst=1)
+            start = time.monotonic()
+            for _ in range(4):
+                await limiter.acquire("api.github.com")
+            await limiter.acquire("other.host")
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.03)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,27 @@
 
 #!/usr/bin/env python3
 
+import pickle
 import unittest
 from unittest.mock import patch, Mock
 from parameterized import parameterized, parameterized_class
+import client
 from client import GithubOrgClient
 from fixtures import TEST_PAYLOAD
 
 
+def clear_shared_payloads():
+    """Forget org and repos payloads shared between client instances."""
+    GithubOrgClient.org.cache_clear()
+    GithubOrgClient.repos_payload.cache_clear()
+
+
 class TestGithubOrgClient(unittest.TestCase):
     """Test cases for GithubOrgClient class."""
+
+    def setUp(self):
+        """Start every test with empty shared payload caches."""
+        clear_shared_payloads()
     
     @parameterized.expand([
         ("google",),
@@ -40,7 +52,7 @@ class TestGithubOrgClient(unittest.TestCase):
             
             self.assertEqual(result, test_payload["repos_url"])
 
-    @patch('client.get_json')
+    @patch('client.get_json_page')
     def test_public_repos(self, mock_get_json):
         """Test that public_repos returns expected list of repo names."""
         test_repos_payload = [
@@ -48,24 +60,82 @@ class TestGithubOrgClient(unittest.TestCase):
             {"name": "repo2", "license": {"key": "apache-2.0"}},
             {"name": "repo3", "license": None}
         ]
-        mock_get_json.return_value = test_repos_payload
+        mock_get_json.return_value = (test_repos_payload, None)
         
         test_repos_url = "https://api.github.com/orgs/test-org/repos"
         
         with patch.object(GithubOrgClient, '_public_repos_url', 
-                         new_callable=lambda: test_repos_url) as mock_repos_url:
+                         new_callable=lambda: test_repos_url):
             client = GithubOrgClient("test-org")
             result = client.public_repos()
             
             expected_repos = ["repo1", "repo2", "repo3"]
             self.assertEqual(result, expected_repos)
             
-            # Verify mocked property was accessed
-            mock_repos_url.__get__ = lambda *args: test_repos_url
-            
             # Verify get_json was called once with the repos URL
             mock_get_json.assert_called_once_with(test_repos_url)
 
+    @parameterized.expand([
+        (False,),
+        (True,),
+    ])
+    @patch('client.get_json_page')
+    def test_public_repos_follows_next_links(self, stream, mock_get_json):
+        """Test that every page linked by rel="next" is consumed."""
+        pages = {
+            "https://api.github.com/orgs/test-org/repos": (
+                [{"name": "repo1", "license": {"key": "mit"}}],
+                "https://api.github.com/orgs/test-org/repos?page=2"),
+            "https://api.github.com/orgs/test-org/repos?page=2": (
+                [{"name": "repo2", "license": {"key": "mit"}}], None),
+        }
+        mock_get_json.side_effect = pages.get
+
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=lambda: next(iter(pages))):
+            client = GithubOrgClient("test-org")
+            result = client.public_repos(license="mit", stream=stream)
+
+        self.assertEqual(result, ["repo1", "repo2"])
+        self.assertEqual(mock_get_json.call_count, 2)
+
+    @patch('client.get_json_page')
+    def test_public_repos_license_index(self, mock_get_json):
+        """Test that license queries share one index over the payload."""
+        mock_get_json.return_value = ([
+            {"name": "repo1", "license": {"key": "mit"}},
+            {"name": "repo2", "license": None},
+            {"name": "repo3", "license": {"key": "mit"}},
+            {"name": "repo4"},
+        ], None)
+
+        with patch.object(GithubOrgClient, '_public_repos_url',
+                          new_callable=lambda: "url"), \
+                patch('client.access_nested_maps',
+                      wraps=client.access_nested_maps) as mock_access:
+            org_client = GithubOrgClient("test-org")
+            self.assertEqual(org_client.public_repos(license="mit"),
+                             ["repo1", "repo3"])
+            self.assertEqual(org_client.public_repos(license="bsd"), [])
+            self.assertEqual(org_client.public_repos(license="mit"),
+                             ["repo1", "repo3"])
+
+        mock_access.assert_called_once()
+        payload = pickle.loads(pickle.dumps(org_client.repos_payload))
+        self.assertEqual(payload.license_index["mit"], ["repo1", "repo3"])
+
+    @patch('client.get_json')
+    def test_org_shared_between_instances(self, mock_get_json):
+        """Test that clients of the same org share one org fetch."""
+        mock_get_json.return_value = {"repos_url": "url"}
+
+        first = GithubOrgClient("google").org
+        second = GithubOrgClient("google").org
+        GithubOrgClient("abc").org
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_get_json.call_count, 2)
+
     @parameterized.expand([
         ({"license": {"key": "my_license"}}, "my_license", True),
         ({"license": {"key": "other_license"}}, "my_license", False),
@@ -85,10 +155,10 @@ class TestIntegrationGithubOrgClient(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Set up class method to start patcher for requests.get."""
-        def side_effect(url):
+        """Set up class method to start patcher for requests.Session.get."""
+        def side_effect(url, **kwargs):
             """Side effect function to return appropriate fixture based on URL."""
-            mock_response = Mock()
+            mock_response = Mock(links={})
             if url == GithubOrgClient.ORG_URL.format(org="google"):
                 mock_response.json.return_value = cls.org_payload
             elif url == cls.org_payload["repos_url"]:
@@ -97,8 +167,12 @@ class TestIntegrationGithubOrgClient(unittest.TestCase):
                 mock_response.json.return_value = {}
             return mock_response
         
-        cls.get_patcher = patch('requests.get', side_effect=side_effect)
+        cls.get_patcher = patch('requests.Session.get', side_effect=side_effect)
         cls.get_patcher.start()
+
+    def setUp(self):
+        """Start every test with empty shared payload caches."""
+        clear_shared_payloads()
     
     @classmethod
     def tearDownClass(cls):
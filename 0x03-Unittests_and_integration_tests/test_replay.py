@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test cases for replay module.
+"""
+import tempfile
+import time
+import unittest
+
+import requests
+from parameterized import parameterized_class
+
+import utils
+from client import GithubOrgClient
+from fixtures import TEST_PAYLOAD
+from replay import ReplayMiss, ReplayStore, mount_replay
+
+
+class TestReplayAdapter(unittest.TestCase):
+    """Test cases for ReplayAdapter."""
+
+    def setUp(self):
+        """Serve the shared session from an empty store."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ReplayStore(self.tmp.name)
+        utils.configure_session()
+
+    def tearDown(self):
+        """Drop the replay mount and the store."""
+        utils.configure_session()
+        self.tmp.cleanup()
+
+    def test_pages_and_latency(self):
+        """Test that pages, Link headers and latency are replayed."""
+        self.store.save_json("http://example.com/a", [1], "http://example.com/b")
+        self.store.save_json("http://example.com/b", [2])
+        adapter = mount_replay(self.store, latency=0.02)
+
+        start = time.monotonic()
+        first = utils.get_json_page("http://example.com/a")
+        second = utils.get_json_page("http://example.com/b")
+
+        self.assertEqual(first, ([1], "http://example.com/b"))
+        self.assertEqual(second, ([2], None))
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(adapter.requests_served, 2)
+
+    def test_streamed_fields(self):
+        """Test that projection streams from a replayed body."""
+        self.store.save_json("http://example.com/repos",
+                             [{"name": "a", "size": 1}])
+        mount_replay(self.store)
+
+        self.assertEqual(utils.get_json("http://example.com/repos",
+                                        fields=[("name",)]),
+                         [{"name": "a"}])
+
+    def test_miss_and_timeout(self):
+        """Test unrecorded URLs and latency beyond the read timeout."""
+        self.store.save_json("http://example.com/slow", {})
+        mount_replay(self.store, latency=0.05)
+
+        with self.assertRaises(ReplayMiss):
+            utils.get_json("http://example.com/missing")
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            utils.get_json("http://example.com/slow", timeout=(1, 0.01))
+
+
+@parameterized_class(
+    ("org_payload", "repos_payload", "expected_repos", "apache2_repos"),
+    TEST_PAYLOAD
+)
+class TestReplayedGithubOrgClient(unittest.TestCase):
+    """GithubOrgClient over the real HTTP path, replayed offline."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Record the fixtures and mount them on the shared session."""
+        cls.tmp = tempfile.TemporaryDirectory()
+        store = ReplayStore(cls.tmp.name)
+        store.save_json(GithubOrgClient.ORG_URL.format(org="google"),
+                        cls.org_payload)
+        store.save_json(cls.org_payload["repos_url"], cls.repos_payload)
+        utils.configure_session()
+        mount_replay(store, latency=0.001)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the replay mount and the store."""
+        utils.configure_session()
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        """Start every test with empty shared payload caches."""
+        GithubOrgClient.org.cache_clear()
+        GithubOrgClient.repos_payload.cache_clear()
+
+    def test_public_repos(self):
+        """Test public_repos against the replayed payloads."""
+        client = GithubOrgClient("google")
+        self.assertEqual(client.public_repos(), self.expected_repos)
+        self.assertEqual(client.public_repos(license="apache-2.0"),
+                         self.apache2_repos)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,10 +50,32 @@ class TestGetJson(unittest.TestCase):
 #!/usr/bin/env python3
 """Test cases for utils module.
 """
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch, Mock
 from parameterized import parameterized
-from utils import access_nested_map, get_json, memoize
+from types import MappingProxyType
+import utils
+from utils import (
+    HTTPCache,
+    access_nested_map,
+    access_nested_maps,
+    compile_path,
+    configure_cache,
+    configure_json,
+    get_json,
+    get_session,
+    invalidate,
+    iter_json_array,
+    make_session,
+    memoize,
+    shared_memoize,
+)
 
 
 class TestAccessNestedMap(unittest.TestCase):
@@ -79,6 +101,38 @@ class TestAccessNestedMap(unittest.TestCase):
         self.assertEqual(str(context.exception), f"'{expected_key}'")
 
 
+class TestCompilePath(unittest.TestCase):
+    """Test cases for compile_path and access_nested_maps."""
+
+    @parameterized.expand([
+        ({"a": 1}, ("a",), 1),
+        ({"a": {"b": 2}}, ("a", "b"), 2),
+        ({"a": MappingProxyType({"b": 2})}, ("a", "b"), 2),
+    ])
+    def test_compile_path(self, nested_map, path, expected):
+        """Test that a compiled path reads like access_nested_map."""
+        self.assertEqual(compile_path(path)(nested_map), expected)
+
+    @parameterized.expand([
+        ({}, ("a",), "a"),
+        ({"a": 1}, ("a", "b"), "b"),
+        ({"a": [1, 2]}, ("a", 0), 0),
+    ])
+    def test_compile_path_exception(self, nested_map, path, expected_key):
+        """Test that a compiled path raises access_nested_map's KeyError."""
+        with self.assertRaises(KeyError) as context:
+            compile_path(path)(nested_map)
+        self.assertEqual(context.exception.args, (expected_key,))
+
+    def test_access_nested_maps(self):
+        """Test bulk access, raising or falling back to default."""
+        maps = [{"a": {"b": 1}}, {"a": None}, {"a": {"b": 3}}]
+        self.assertEqual(access_nested_maps(maps, ("a", "b"), default=None),
+                         [1, None, 3])
+        with self.assertRaises(KeyError):
+            access_nested_maps(maps, ("a", "b"))
+
+
 class TestGetJson(unittest.TestCase):
     """Test cases for get_json function."""
     
@@ -86,7 +140,7 @@ class TestGetJson(unittest.TestCase):
         ("http://example.com", {"payload": True}),
         ("http://holberton.io", {"payload": False}),
     ])
-    @patch('utils.requests.get')
+    @patch('utils.requests.Session.get')
     def test_get_json(self, test_url, test_payload, mock_get):
         """Test that get_json returns expected result without making HTTP calls."""
         mock_response = Mock()
@@ -95,10 +149,153 @@ class TestGetJson(unittest.TestCase):
         
         result = get_json(test_url)
         
-        mock_get.assert_called_once_with(test_url)
+        mock_get.assert_called_once_with(test_url, timeout=utils.DEFAULT_TIMEOUT)
         self.assertEqual(result, test_payload)
 
 
+class TestJsonDecoding(unittest.TestCase):
+    """Test cases for JSON backends, streaming and projection."""
+
+    BODY = ('[{"name": "r\u00e9po1", "license": {"key": "mit", "url": "u"},'
+            ' "size": 120}, {"name": "repo2", "license": null}, 7]')
+
+    @parameterized.expand([(1,), (7,), (4096,)])
+    def test_iter_json_array(self, chunk_size):
+        """Test that items decode the same however the body is split."""
+        body = self.BODY.encode()
+        chunks = [body[i:i + chunk_size]
+                  for i in range(0, len(body), chunk_size)]
+        self.assertEqual(list(iter_json_array(chunks)), json.loads(body))
+
+    def test_iter_json_array_every_split(self):
+        """Test numbers split at every offset, e.g. after "1." or "1e"."""
+        body = b'[1.5, -2e10, 3.25E-3, 0, {"a": [1.0, 2e+5]}, "x", true]'
+        for offset in range(len(body) + 1):
+            self.assertEqual(
+                list(iter_json_array([body[:offset], body[offset:]])),
+                json.loads(body), offset)
+
+    @parameterized.expand([
+        (b'{"a": 1}',),
+        (b'[1 2]',),
+        (b'[1,]',),
+        (b'[1,,2]',),
+        (b'[1',),
+        (b'[1,2]garbage',),
+        (b'[1] [2]',),
+    ])
+    def test_iter_json_array_rejects_invalid(self, body):
+        """Test that non-arrays and malformed arrays raise ValueError."""
+        with self.assertRaises(ValueError):
+            list(iter_json_array([body]))
+
+    @patch('utils.requests.Session.get')
+    def test_get_json_fields(self, mock_get):
+        """Test that fields streams the body and keeps only those keys."""
+        body = self.BODY.encode()
+        mock_get.return_value = Mock(
+            links={}, iter_content=Mock(return_value=iter([body[:9], body[9:]])))
+
+        result = get_json("http://example.com",
+                          fields=[("name",), ("license", "key")])
+
+        self.assertEqual(result, [
+            {"name": "r\u00e9po1", "license": {"key": "mit"}},
+            {"name": "repo2", "license": None},
+            7,
+        ])
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        mock_get.return_value.close.assert_called_once()
+
+    @patch('utils.requests.Session.get')
+    def test_configure_json_backend(self, mock_get):
+        """Test that a configured backend decodes the raw body."""
+        mock_get.return_value = Mock(content=b'{"a": 1}', links={})
+        loads = Mock(return_value={"a": 1})
+        configure_json(loads)
+        try:
+            self.assertEqual(get_json("http://example.com"), {"a": 1})
+        finally:
+            configure_json(None)
+        loads.assert_called_once_with(b'{"a": 1}')
+        mock_get.return_value.json.assert_not_called()
+
+    @patch('utils.requests.Session.get')
+    def test_configure_json_cached_body_is_bytes(self, mock_get):
+        """Test that a body served from the cache reaches loads as bytes."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = configure_cache(directory)
+            cache.set("http://example.com", '"v1"', None, '{"a": 1}')
+            mock_get.return_value = Mock(status_code=304, headers={})
+            loads = Mock(return_value={"a": 1})
+            configure_json(loads)
+            try:
+                self.assertEqual(get_json("http://example.com"), {"a": 1})
+            finally:
+                configure_json(None)
+                configure_cache(None)
+        loads.assert_called_once_with(b'{"a": 1}')
+
+
+class TestSession(unittest.TestCase):
+    """Test cases for the shared HTTP session."""
+
+    def test_get_session_is_shared(self):
+        """Test that get_session returns the same session every time."""
+        self.assertIs(get_session(), get_session())
+
+    def test_make_session_mounts_pooled_retrying_adapter(self):
+        """Test that make_session configures pool size and retries."""
+        session = make_session(pool_maxsize=4, retries=5)
+        adapter = session.get_adapter("https://api.github.com")
+
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 5)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Test cases for conditional-request caching in get_json."""
+
+    def setUp(self):
+        """Enable the cache in a fresh temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        configure_cache(self.tmp.name)
+
+    def tearDown(self):
+        """Disable the cache and remove its directory."""
+        configure_cache(None)
+        self.tmp.cleanup()
+
+    @patch('utils.requests.Session.get')
+    def test_revalidates_and_serves_304_from_cache(self, mock_get):
+        """Test that a stored ETag is sent back and a 304 uses the cache."""
+        first = Mock(status_code=200, headers={"ETag": '"v1"'},
+                     text='{"repos_url": "x"}', links={})
+        first.json.return_value = {"repos_url": "x"}
+        not_modified = Mock(status_code=304, headers={})
+        mock_get.side_effect = [first, not_modified]
+
+        self.assertEqual(get_json("http://example.com"), {"repos_url": "x"})
+        self.assertEqual(get_json("http://example.com"), {"repos_url": "x"})
+
+        second_headers = mock_get.call_args_list[1].kwargs["headers"]
+        self.assertEqual(second_headers, {"If-None-Match": '"v1"'})
+        not_modified.json.assert_not_called()
+
+    def test_evicts_least_recently_used(self):
+        """Test that the store keeps at most max_entries entries."""
+        cache = HTTPCache(self.tmp.name, max_entries=2)
+        cache.set("http://a", '"a"', None, "{}")
+        os.utime(cache._path("http://a"), (1, 1))
+        cache.set("http://b", '"b"', None, "{}")
+        os.utime(cache._path("http://b"), (2, 2))
+        cache.set("http://c", '"c"', None, "{}")
+
+        self.assertIsNone(cache.get("http://a"))
+        self.assertEqual(cache.get("http://c")["etag"], '"c"')
+
+
 class TestMemoize(unittest.TestCase):
     """Test cases for memoize decorator."""
     def test_memoize(self):
@@ -123,5 +320,123 @@ class TestMemoize(unittest.TestCase):
             
             mock_method.assert_called_once()
 
+    def test_memoize_ttl_expires(self):
+        """Test that a value older than ttl is recomputed."""
+        calls = []
+
+        class TestClass:
+
+            @memoize(ttl=10)
+            def a_property(self):
+                calls.append(1)
+                return len(calls)
+
+        test_instance = TestClass()
+        with patch('utils.time.monotonic', return_value=100):
+            self.assertEqual(test_instance.a_property, 1)
+        with patch('utils.time.monotonic', return_value=105):
+            self.assertEqual(test_instance.a_property, 1)
+        with patch('utils.time.monotonic', return_value=111):
+            self.assertEqual(test_instance.a_property, 2)
+
+    def test_invalidate_and_cache_info(self):
+        """Test explicit invalidation and the hit/miss counters."""
+        class TestClass:
+
+            @memoize
+            def a_property(self):
+                return object()
+
+        test_instance = TestClass()
+        first = test_instance.a_property
+        self.assertIs(test_instance.a_property, first)
+        invalidate(test_instance, "a_property")
+        self.assertIsNot(test_instance.a_property, first)
+        self.assertEqual(TestClass.a_property.cache_info(),
+                         {"hits": 1, "misses": 2})
+
+    def test_memoize_single_flight(self):
+        """Test that concurrent first accesses compute the value once."""
+        calls = []
+
+        class TestClass:
+
+            @memoize
+            def a_property(self):
+                calls.append(1)
+                time.sleep(0.05)
+                return 42
+
+        test_instance = TestClass()
+        threads = [threading.Thread(target=lambda: test_instance.a_property)
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+
+    def test_memoized_object_can_be_copied(self):
+        """Test that reading a memoized property leaves no lock behind."""
+        class TestClass:
+
+            @memoize
+            def a_property(self):
+                return [42]
+
+        test_instance = TestClass()
+        test_instance.a_property
+        copied = copy.deepcopy(test_instance)
+
+        self.assertEqual(copied.a_property, [42])
+        self.assertEqual(TestClass.a_property._locks, {})
+
+
+class TestSharedMemoize(unittest.TestCase):
+    """Test cases for shared_memoize decorator."""
+
+    def make_class(self, calls, **kwargs):
+        """Build a class whose payload is shared by name."""
+        class TestClass:
+
+            def __init__(self, name):
+                self.name = name
+
+            @shared_memoize(key=lambda self: self.name, **kwargs)
+            def payload(self):
+                calls.append(self.name)
+                return [self.name]
+
+        return TestClass
+
+    def test_shared_between_instances(self):
+        """Test that instances with the same key share one computation."""
+        calls = []
+        TestClass = self.make_class(calls)
+
+        self.assertIs(TestClass("a").payload, TestClass("a").payload)
+        TestClass("b").payload
+        self.assertEqual(calls, ["a", "b"])
+        self.assertEqual(TestClass.payload.cache_info()["hits"], 1)
+
+    def test_lru_bound_and_ttl(self):
+        """Test eviction of the least recently used key and expiry."""
+        calls = []
+        TestClass = self.make_class(calls, maxsize=2, ttl=10)
+
+        with patch('utils.time.monotonic', return_value=100):
+            TestClass("a").payload
+            TestClass("b").payload
+            TestClass("a").payload
+            TestClass("c").payload
+            TestClass("a").payload
+            TestClass("b").payload
+        with patch('utils.time.monotonic', return_value=200):
+            TestClass("b").payload
+
+        self.assertEqual(calls, ["a", "b", "c", "b", "b"])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,22 +1,76 @@
 #!/usr/bin/env python3
 """Generic utilities for github org client.
 """
+import codecs
+import hashlib
+import itertools
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import weakref
 import requests
+from collections import OrderedDict
+from collections import abc
+from contextlib import contextmanager
 from functools import wraps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from typing import (
     Mapping,
     Sequence,
     Any,
     Dict,
     Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
 )
 
 __all__ = [
+    "HTTPCache",
+    "MemoizedProperty",
+    "SharedMemoizedProperty",
     "access_nested_map",
+    "access_nested_maps",
+    "compile_path",
+    "configure_cache",
+    "configure_json",
+    "configure_session",
+    "ensure_pool_maxsize",
     "get_json",
+    "get_json_page",
+    "get_session",
+    "invalidate",
+    "iter_json_array",
+    "make_session",
     "memoize",
+    "project",
+    "shared_memoize",
 ]
 
+DEFAULT_TIMEOUT = (3.05, 10)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+# (pool_connections, pool_maxsize) of each session built by make_session
+_pool_sizes: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_http_cache: Optional["HTTPCache"] = None
+_json_loads: Optional[Callable[[bytes], Any]] = None
+
 
 def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     """Access nested map with key path.
@@ -40,15 +94,524 @@ def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     return nested_map
 
 
-def get_json(url: str) -> Dict:
+_MISSING = object()
+
+
+def compile_path(path: Sequence) -> Callable[[Mapping], Any]:
+    """Compile a key path once into an accessor equivalent to
+    access_nested_map(nested_map, path), raising the same KeyError.
+    Plain dicts skip the Mapping ABC check, which dominates the cost of
+    access_nested_map in hot loops.
+    Example
+    -------
+    >>> license_key = compile_path(("license", "key"))
+    >>> license_key({"license": {"key": "mit"}})
+    'mit'
+    """
+    keys = tuple(path)
+
+    def accessor(nested_map: Mapping) -> Any:
+        for key in keys:
+            if type(nested_map) is not dict \
+                    and not isinstance(nested_map, abc.Mapping):
+                raise KeyError(key)
+            nested_map = nested_map[key]
+        return nested_map
+
+    return accessor
+
+
+def access_nested_maps(nested_maps: Iterable[Mapping], path: Sequence,
+                       default: Any = _MISSING) -> List[Any]:
+    """Access path in each of nested_maps.
+    A missing path raises KeyError as in access_nested_map, unless
+    default is given, which is then used for that map instead.
+    """
+    accessor = compile_path(path)
+    if default is _MISSING:
+        return [accessor(nested_map) for nested_map in nested_maps]
+    values = []
+    for nested_map in nested_maps:
+        try:
+            values.append(accessor(nested_map))
+        except KeyError:
+            values.append(default)
+    return values
+
+
+def make_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    retries: int = 3,
+    backoff_factor: float = 0.3,
+) -> requests.Session:
+    """Build a session with pooled keep-alive connections and retries.
+    Idempotent requests are retried on connection errors and on 429/5xx
+    responses, with exponential backoff that honours Retry-After.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    _pool_sizes[session] = (pool_connections, pool_maxsize)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def configure_session(**kwargs: Any) -> requests.Session:
+    """Replace the shared session with one built by make_session(**kwargs).
+    """
+    global _session
+    with _session_lock:
+        old, _session = _session, make_session(**kwargs)
+    if old is not None:
+        old.close()
+    return _session
+
+
+def ensure_pool_maxsize(size: int) -> requests.Session:
+    """Let the shared session keep at least size connections per host.
+    Smaller HTTP adapters are replaced by fresh ones with the same retry
+    settings; requests already running finish on the old adapter.
+    """
+    session = get_session()
+    with _session_lock:
+        pool_connections, pool_maxsize = _pool_sizes.get(session, (10, 0))
+        if pool_maxsize >= size:
+            return session
+        for prefix, adapter in list(session.adapters.items()):
+            if isinstance(adapter, HTTPAdapter):
+                session.mount(prefix, HTTPAdapter(
+                    pool_connections=pool_connections,
+                    pool_maxsize=size,
+                    max_retries=adapter.max_retries,
+                ))
+        _pool_sizes[session] = (pool_connections, size)
+    return session
+
+
+class HTTPCache:
+    """Bounded on-disk cache of JSON responses and their validators.
+    Each URL is stored as one file holding its ETag, Last-Modified and
+    raw body. Once the store holds more than max_entries files or
+    max_bytes bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = 1000,
+        max_bytes: int = 50 * 1024 * 1024,
+    ) -> None:
+        """Init method of HTTPCache"""
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        """File holding the entry for url"""
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, name + ".json")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored entry for url, or None"""
+        path = self._path(url)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        return entry
+
+    def touch(self, url: str) -> None:
+        """Mark the entry for url as recently used"""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def set(self, url: str, etag: Optional[str],
+            last_modified: Optional[str], body: str,
+            next_url: Optional[str] = None) -> None:
+        """Store body with its validators, then enforce the size bounds"""
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "next": next_url,
+            "body": body,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(url))
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within bounds"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            while entries and (len(entries) > self.max_entries
+                               or total > self.max_bytes):
+                _, size, path = entries.pop(0)
+                total -= size
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def configure_cache(
+    directory: Optional[str],
+    **kwargs: Any,
+) -> Optional[HTTPCache]:
+    """Enable the conditional-request cache in directory, or disable it
+    when directory is None. kwargs are passed to HTTPCache.
+    """
+    global _http_cache
+    _http_cache = HTTPCache(directory, **kwargs) if directory else None
+    return _http_cache
+
+
+def configure_json(loads: Any = _MISSING) -> Optional[Callable]:
+    """Decode response bodies with loads(bytes) instead of
+    response.json(). Without an argument orjson is used when installed;
+    None restores response.json().
+    """
+    global _json_loads
+    if loads is _MISSING:
+        loads = orjson.loads if orjson is not None else None
+    _json_loads = loads
+    return _json_loads
+
+
+def _decode(response: requests.Response) -> Any:
+    """Response body decoded with the configured JSON backend"""
+    if _json_loads is None:
+        return response.json()
+    return _json_loads(response.content)
+
+
+def _field_spec(fields: Iterable[Sequence]) -> Dict:
+    """Nest key paths into a tree; None marks a path's last key"""
+    spec: Dict = {}
+    for path in fields:
+        node = spec
+        for key in path[:-1]:
+            child = node.setdefault(key, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+    return spec
+
+
+def project(value: Any, fields: Iterable[Sequence]) -> Any:
+    """Keep only the given key paths of value, or of each item when
+    value is a list. Missing keys are left out and a non-Mapping found
+    part way along a path is kept as is, so access_nested_map on the
+    result behaves as it would on value.
+    Example
+    -------
+    >>> project({"name": "a", "license": {"key": "mit", "url": "u"},
+    ...          "size": 3}, [("name",), ("license", "key")])
+    {'name': 'a', 'license': {'key': 'mit'}}
+    """
+    spec = _field_spec(fields)
+    if isinstance(value, list):
+        return [_project(item, spec) for item in value]
+    return _project(value, spec)
+
+
+def _project(value: Any, spec: Optional[Dict]) -> Any:
+    """project() against a spec built by _field_spec"""
+    if spec is None or not isinstance(value, abc.Mapping):
+        return value
+    return {key: _project(value[key], sub)
+            for key, sub in spec.items() if key in value}
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = frozenset(",] \t\n\r")
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array read from UTF-8 chunks,
+    decoding one item at a time so the whole document is never held
+    decoded at once. Raises ValueError if the input is not an array.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    # expecting: "[" to open, an item or "]" first, an item after ",",
+    # then "," or "]" after each item, and only whitespace after "]"
+    buffer, expect, eof = "", "[", False
+    chunks = iter(chunks)
+    while not eof:
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buffer += text.decode(chunk or b"", final=eof)
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if expect == "end":
+                raise ValueError(
+                    "unexpected {!r} after JSON array".format(char))
+            if expect == "[":
+                if char != "[":
+                    raise ValueError("expected a JSON array")
+                expect, pos = "first", pos + 1
+                continue
+            if expect == "," or char == "]":
+                if char == "]" and expect != "item":
+                    expect, pos = "end", pos + 1
+                    continue
+                if char != "," or expect != ",":
+                    raise ValueError(
+                        "unexpected {!r} in JSON array".format(char))
+                expect, pos = "item", pos + 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    raise
+                break
+            # only complete once followed by a delimiter: "1" may still
+            # continue as "1.5" or "1e5" in the next chunk
+            if end == len(buffer) or buffer[end] not in _DELIMITERS:
+                if eof and end < len(buffer):
+                    raise ValueError(
+                        "unexpected {!r} in JSON array".format(buffer[end]))
+                break
+            yield item
+            expect, pos = ",", end
+        buffer = buffer[pos:]
+    if expect != "end":
+        raise ValueError("unterminated JSON array")
+
+
+def _get_projected(
+    url: str,
+    timeout: Union[float, Tuple[float, float]],
+    fields: Iterable[Sequence],
+) -> Tuple[Any, Optional[str]]:
+    """Stream url, projecting array items to fields as they are parsed.
+    Bodies that are not arrays are decoded whole and then projected.
+    """
+    spec = _field_spec(fields)
+    response = get_session().get(url, timeout=timeout, stream=True)
+    try:
+        next_url = _next_link(response)
+        chunks = response.iter_content(STREAM_CHUNK_SIZE)
+        head = b""
+        for head in chunks:
+            if head.strip():
+                break
+        if not head.lstrip().startswith(b"["):
+            body = head + b"".join(chunks)
+            value = (_json_loads or json.loads)(body)
+            return _project(value, spec), next_url
+        items = iter_json_array(itertools.chain([head], chunks))
+        return [_project(item, spec) for item in items], next_url
+    finally:
+        response.close()
+
+
+def _next_link(response: requests.Response) -> Optional[str]:
+    """URL of the Link header's rel="next" entry, if any"""
+    return response.links.get("next", {}).get("url")
+
+
+def get_json_page(
+    url: str,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    fields: Optional[Iterable[Sequence]] = None,
+) -> Tuple[Any, Optional[str]]:
+    """Get JSON from remote URL along with the URL of the next page,
+    taken from the Link header (None on the last page).
+    Uses the shared session so repeated calls reuse TCP/TLS connections.
+    With a cache configured, stored responses are revalidated with
+    If-None-Match/If-Modified-Since and served from disk on 304.
+    With fields (key paths), only those are kept; see project. Array
+    bodies are then parsed item by item while they stream in.
+    """
+    cache = _http_cache
+    if cache is None:
+        if fields is not None:
+            return _get_projected(url, timeout, fields)
+        response = get_session().get(url, timeout=timeout)
+        return _decode(response), _next_link(response)
+
+    entry = cache.get(url)
+    headers = {}
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+    response = get_session().get(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        cache.touch(url)
+        body = entry["body"].encode("utf-8")
+        value = (_json_loads or json.loads)(body)
+        next_url = entry.get("next")
+    else:
+        next_url = _next_link(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            cache.set(url, etag, last_modified, response.text, next_url)
+        value = _decode(response)
+    if fields is not None:
+        value = project(value, fields)
+    return value, next_url
+
+
+def get_json(
+    url: str,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    fields: Optional[Iterable[Sequence]] = None,
+) -> Dict:
     """Get JSON from remote URL.
+    See get_json_page for connection reuse, caching and fields.
+    """
+    return get_json_page(url, timeout, fields)[0]
+
+
+class MemoizedProperty:
+    """Read-only property computing its value once per instance.
+    The value is stored on the instance as "_<name>". With ttl (seconds)
+    it is recomputed once older than that. Concurrent first accesses are
+    single-flight: one thread computes while the others wait for its
+    result. hits and misses count lookups across all instances.
     """
-    response = requests.get(url)
-    return response.json()
 
+    def __init__(self, fn: Callable, ttl: Optional[float] = None) -> None:
+        """Init method of MemoizedProperty"""
+        self.fn = fn
+        self.ttl = ttl
+        self.attr_name = "_{}".format(fn.__name__)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._locks: Dict[int, List] = {}
+        wraps(fn)(self)
+
+    def _is_fresh(self, obj: Any) -> bool:
+        """Whether obj holds an unexpired value"""
+        if self.attr_name not in obj.__dict__:
+            return False
+        if self.ttl is None:
+            return True
+        expires = obj.__dict__.get("_memoize_expires", {})
+        return expires.get(self.attr_name, 0) > time.monotonic()
 
-def memoize(fn: Callable) -> Callable:
+    @contextmanager
+    def _instance_lock(self, obj: Any) -> Iterator[None]:
+        """Hold the lock serialising computation of this attribute on obj.
+        Locks live on the descriptor, not the instance, so memoized
+        objects stay picklable; each is dropped once no thread holds it.
+        """
+        key = id(obj)
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        if self._is_fresh(obj):
+            with self._lock:
+                self.hits += 1
+            return obj.__dict__[self.attr_name]
+        with self._instance_lock(obj):
+            if self._is_fresh(obj):
+                with self._lock:
+                    self.hits += 1
+                return obj.__dict__[self.attr_name]
+            with self._lock:
+                self.misses += 1
+            value = self.fn(obj)
+            obj.__dict__[self.attr_name] = value
+            if self.ttl is not None:
+                expires = obj.__dict__.setdefault("_memoize_expires", {})
+                expires[self.attr_name] = time.monotonic() + self.ttl
+            return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        raise AttributeError("can't set attribute")
+
+    def invalidate(self, obj: Any) -> None:
+        """Forget the value memoized on obj"""
+        obj.__dict__.pop(self.attr_name, None)
+        obj.__dict__.get("_memoize_expires", {}).pop(self.attr_name, None)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit and miss counters"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def memoize(
+    fn: Optional[Callable] = None, *, ttl: Optional[float] = None
+) -> Any:
     """Decorator to memoize a method.
+    Usable bare or as memoize(ttl=seconds); see MemoizedProperty.
     Example
     -------
     class MyClass:
@@ -63,14 +626,122 @@ def memoize(fn: Callable) -> Callable:
     >>> my_object.a_method
     42
     """
-    attr_name = "_{}".format(fn.__name__)
+    if fn is None:
+        return lambda fn: MemoizedProperty(fn, ttl)
+    return MemoizedProperty(fn, ttl)
+
+
+class SharedMemoizedProperty:
+    """Read-only property whose values are shared between instances.
+    Values live in one LRU cache per property, keyed by key(instance),
+    so two instances with the same key share a single computation.
+    At most maxsize keys are kept and, with ttl, values older than ttl
+    seconds are recomputed. Computation is single-flight per key.
+    Cached values are shared objects and must not be mutated.
+    """
+
+    def __init__(self, fn: Callable, key: Callable[[Any], Hashable],
+                 maxsize: int = 128, ttl: Optional[float] = None) -> None:
+        """Init method of SharedMemoizedProperty"""
+        self.fn = fn
+        self.key = key
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Hashable, Tuple[Any, float]]" = \
+            OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        wraps(fn)(self)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """(found, value) for a fresh entry; must hold self._lock"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        value, expires = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        key = self.key(obj)
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                self.misses += 1
+            try:
+                value = self.fn(obj)
+            except BaseException:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+            expires = time.monotonic() + self.ttl \
+                if self.ttl is not None else float("inf")
+            with self._lock:
+                self._cache[key] = (value, expires)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+                self._key_locks.pop(key, None)
+            return value
 
-    @wraps(fn)
-    def memoized(self):
-        """"memoized wraps"""
-        if not hasattr(self, attr_name):
-            setattr(self, attr_name, fn(self))
-        return getattr(self, attr_name)
+    def __set__(self, obj: Any, value: Any) -> None:
+        raise AttributeError("can't set attribute")
 
-    return property(memoized)
+    def invalidate(self, obj: Any) -> None:
+        """Forget the value shared under obj's key"""
+        with self._lock:
+            self._cache.pop(self.key(obj), None)
 
+    def cache_clear(self) -> None:
+        """Forget every value and reset the counters"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit and miss counters and current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "currsize": len(self._cache), "maxsize": self.maxsize}
+
+
+def shared_memoize(key: Callable[[Any], Hashable], maxsize: int = 128,
+                   ttl: Optional[float] = None) -> Callable:
+    """Decorator to memoize a method across instances sharing key.
+    Example
+    -------
+    class Client:
+        def __init__(self, name):
+            self.name = name
+
+        @shared_memoize(key=lambda self: self.name, ttl=60)
+        def payload(self):
+            return fetch(self.name)
+    >>> Client("a").payload is Client("a").payload
+    True
+    """
+    return lambda fn: SharedMemoizedProperty(fn, key, maxsize, ttl)
+
+
+def invalidate(obj: Any, name: str) -> None:
+    """Forget the memoized value of property name on obj.
+    Example
+    -------
+    >>> invalidate(client, "org")
+    """
+    getattr(type(obj), name).invalidate(obj)
@@ -1,14 +1,43 @@
-import sqlite3
+from db_profiles import connect
+from connection_pool import WriteBuffer
 
 
 class DatabaseConnection:
-   def __init__(self, db_name):
+   """Open `db_name` on enter and close it on exit.
+
+   `profile` is a preset name from db_profiles.PROFILES ("durable",
+   "balanced", "fast") or a mapping of PRAGMA names to values, applied
+   right after the connection is opened.
+
+   With `pool` (a connection_pool.ConnectionPool or ThreadLocalPool) the
+   connection is borrowed from the pool on enter and returned on exit,
+   with uncommitted work rolled back, instead of being opened and closed.
+   `profile` is then the pool's business.
+
+   With `router` (a connection_pool.ReadWriteRouter), mode="read" borrows a
+   read-only connection, while mode="write" yields a buffer whose
+   execute()/executemany() calls are queued to the single writer thread
+   as one transaction when the block exits cleanly.
+   """
+
+   def __init__(self, db_name, profile=None, pool=None, router=None, mode="read"):
+       if mode not in ("read", "write"):
+           raise ValueError(f"mode must be 'read' or 'write', not {mode!r}")
        self.db_name = db_name
+       self.profile = profile
+       self.pool = router.readers if router is not None and mode == "read" else pool
+       self.router = router
+       self.mode = mode
        self.connection = None
 
 
    def __enter__(self):
-       self.connection = sqlite3.connect(self.db_name)
+       if self.router is not None and self.mode == "write":
+           self.connection = WriteBuffer()
+       elif self.pool is not None:
+           self.connection = self.pool.acquire()
+       else:
+           self.connection = connect(self.db_name, self.profile)
        return self.connection
 
 
@@ -16,11 +45,18 @@ class DatabaseConnection:
        if self.connection:
            if exc_type:
                print("An error occurred:", exc_val)
-           self.connection.close()
+           if isinstance(self.connection, WriteBuffer):
+               if not exc_type:
+                   self.router.submit(self.connection.apply).result()
+           elif self.pool is not None:
+               self.pool.release(self.connection)
+           else:
+               self.connection.close()
+           self.connection = None
 
 
 if __name__ == "__main__":
-   with DatabaseConnection("users.db") as conn:
+   with DatabaseConnection("users.db", profile="balanced") as conn:
        cursor = conn.cursor()
        cursor.execute("SELECT * FROM users")
        results = cursor.fetchall()
@@ -2,10 +2,22 @@ import sqlite3
 
 
 class ExecuteQuery:
-   def __init__(self, db_name, query, params=()):
+   """Run `query` on enter and return its results.
+
+   By default all rows are fetched and returned as a list. With
+   `stream=True` the context manager returns an iterator that pulls rows
+   `chunk_size` at a time with fetchmany(), keeping the connection open
+   until exit, so memory stays flat regardless of result size.
+   `row_factory` (e.g. sqlite3.Row) is installed on the connection.
+   """
+
+   def __init__(self, db_name, query, params=(), stream=False, chunk_size=1000, row_factory=None):
        self.db_name = db_name
        self.query = query
        self.params = params
+       self.stream = stream
+       self.chunk_size = chunk_size
+       self.row_factory = row_factory
        self.connection = None
        self.cursor = None
        self.results = None
@@ -13,12 +25,30 @@ class ExecuteQuery:
 
    def __enter__(self):
        self.connection = sqlite3.connect(self.db_name)
+       if self.row_factory is not None:
+           self.connection.row_factory = self.row_factory
        self.cursor = self.connection.cursor()
        self.cursor.execute(self.query, self.params)
+       if self.stream:
+           return self.iter_rows()
        self.results = self.cursor.fetchall()
        return self.results
 
 
+   def iter_chunks(self):
+       """Yield lists of up to `chunk_size` rows until the result is exhausted."""
+       while True:
+           chunk = self.cursor.fetchmany(self.chunk_size)
+           if not chunk:
+               return
+           yield chunk
+
+
+   def iter_rows(self):
+       for chunk in self.iter_chunks():
+           yield from chunk
+
+
    def __exit__(self, exc_type, exc_val, exc_tb):
        if self.cursor:
            self.cursor.close()
@@ -31,6 +61,6 @@ class ExecuteQuery:
 if __name__ == "__main__":
    query = "SELECT * FROM users WHERE age > ?"
    params = (25,)
-   with ExecuteQuery("users.db", query, params) as results:
+   with ExecuteQuery("users.db", query, params, stream=True) as results:
        for row in results:
-           print(row)
\ No newline at end of file
+           print(row)
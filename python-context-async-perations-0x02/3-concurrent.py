@@ -1,35 +1,42 @@
 import asyncio
-import aiosqlite
+
+from async_pool import AsyncConnectionPool, QueryExecutor
+from dataloader import RowLoader
 
 
 # Async function to fetch all users
-async def async_fetch_users():
-   async with aiosqlite.connect("users.db") as db:
-       async with db.execute("SELECT * FROM users") as cursor:
-           rows = await cursor.fetchall()
-           print("All Users:")
-           for row in rows:
-               print(row)
+async def async_fetch_users(executor):
+   return await executor.fetchall("SELECT * FROM users")
 
 
 # Async function to fetch users older than 40
-async def async_fetch_older_users():
-   async with aiosqlite.connect("users.db") as db:
-       async with db.execute("SELECT * FROM users WHERE age > 40") as cursor:
-           rows = await cursor.fetchall()
-           print("\nUsers older than 40:")
-           for row in rows:
-               print(row)
+async def async_fetch_older_users(executor):
+   return await executor.fetchall("SELECT * FROM users WHERE age > ?", (40,))
 
 
 # Function to run both concurrently
-async def fetch_concurrently():
-   await asyncio.gather(
-       async_fetch_users(),
-       async_fetch_older_users()
-   )
+async def fetch_concurrently(db_name="users.db", pool_size=2, timeout=None):
+   async with AsyncConnectionPool(db_name, size=pool_size) as pool:
+       executor = QueryExecutor(pool, timeout=timeout)
+       return await asyncio.gather(
+           async_fetch_users(executor),
+           async_fetch_older_users(executor)
+       )
+
+
+# Fetch many users by id; concurrent lookups share one IN (...) query
+async def async_fetch_users_by_ids(user_ids, db_name="users.db"):
+   async with AsyncConnectionPool(db_name, size=1) as pool:
+       loader = RowLoader(QueryExecutor(pool), table="users", key="id")
+       return await asyncio.gather(*(loader.load(user_id) for user_id in user_ids))
 
 
 # Run the concurrent fetch
 if __name__ == "__main__":
-   asyncio.run(fetch_concurrently())
+   users, older_users = asyncio.run(fetch_concurrently(timeout=5.0))
+   print("All Users:")
+   for row in users:
+       print(row)
+   print("\nUsers older than 40:")
+   for row in older_users:
+       print(row)
@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+
+import aiosqlite
+
+from db_profiles import pragma_statements
+
+_DEFAULT = object()
+
+
+class AsyncConnectionPool:
+   """Fixed pool of `size` aiosqlite connections to `db_name`.
+
+   Every aiosqlite connection runs its statements on its own thread, so N
+   pooled connections let up to N queries execute in parallel.
+   """
+
+   def __init__(self, db_name, size=4, profile=None):
+       self.db_name = db_name
+       self.size = size
+       self.profile = profile
+       self.idle = None
+       self.connections = []
+
+   async def open(self):
+       self.idle = asyncio.LifoQueue()
+       for _ in range(self.size):
+           conn = await aiosqlite.connect(self.db_name)
+           for statement in pragma_statements(self.profile):
+               await conn.execute(statement)
+           self.connections.append(conn)
+           self.idle.put_nowait(conn)
+       return self
+
+   async def close(self):
+       connections, self.connections = self.connections, []
+       for conn in connections:
+           await conn.close()
+
+   async def __aenter__(self):
+       return await self.open()
+
+   async def __aexit__(self, exc_type, exc_val, exc_tb):
+       await self.close()
+
+   async def acquire(self):
+       return await self.idle.get()
+
+   async def release(self, conn):
+       if conn.in_transaction:
+           await conn.rollback()
+       self.idle.put_nowait(conn)
+
+   @contextlib.asynccontextmanager
+   async def connection(self):
+       conn = await self.acquire()
+       try:
+           yield conn
+       finally:
+           await self.release(conn)
+
+
+class QueryExecutor:
+   """Run queries on a pool with at most `max_concurrency` in flight.
+
+   `timeout` (seconds, overridable per call) bounds the whole call,
+   including the wait for a free connection. When a call times out or its
+   task is cancelled, the running SQLite statement is interrupted so the
+   connection's thread is freed at once, and the connection goes back to
+   the pool before asyncio.TimeoutError/CancelledError propagates.
+   """
+
+   def __init__(self, pool, max_concurrency=None, timeout=None):
+       self.pool = pool
+       self.semaphore = asyncio.Semaphore(max_concurrency or pool.size)
+       self.timeout = timeout
+
+   async def _fetchall(self, query, params):
+       async with self.semaphore:
+           async with self.pool.connection() as conn:
+               cursor = None
+               try:
+                   cursor = await conn.execute(query, params)
+                   return await cursor.fetchall()
+               except asyncio.CancelledError:
+                   # ✅ Not queued behind the statement: stops it on its own thread
+                   await conn.interrupt()
+                   raise
+               finally:
+                   if cursor is not None:
+                       await cursor.close()
+
+   async def fetchall(self, query, params=(), timeout=_DEFAULT):
+       if timeout is _DEFAULT:
+           timeout = self.timeout
+       if timeout is None:
+           return await self._fetchall(query, params)
+       return await asyncio.wait_for(self._fetchall(query, params), timeout)
+
+   async def iter_chunks(self, query, params=(), chunk_size=1000):
+       """Yield lists of up to `chunk_size` rows, holding one pooled connection."""
+       async with self.semaphore:
+           async with self.pool.connection() as conn:
+               cursor = None
+               try:
+                   cursor = await conn.execute(query, params)
+                   while True:
+                       chunk = await cursor.fetchmany(chunk_size)
+                       if not chunk:
+                           return
+                       yield chunk
+               except asyncio.CancelledError:
+                   await conn.interrupt()
+                   raise
+               finally:
+                   if cursor is not None:
+                       await cursor.close()
+
+   async def fetch_many(self, queries, timeout=_DEFAULT):
+       """Run `(query, params)` pairs concurrently; results keep input order."""
+       return await asyncio.gather(
+           *(self.fetchall(query, params, timeout) for query, params in queries))
@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import asyncio
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import concurrent.futures
+
+from benchmarks import seed_users
+from connection_pool import ConnectionPool
+from async_pool import AsyncConnectionPool, QueryExecutor
+
+DECORATORS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python-decorators-0x01")
+
+POINT_QUERY = "SELECT * FROM users WHERE id = ?"
+RANGE_QUERY = "SELECT id, name FROM users WHERE age = ? LIMIT 50"
+
+
+def build_workload(operations, rows, seed, range_ratio=0.1):
+   """Return a deterministic list of (query, params) pairs."""
+   rng = random.Random(seed)
+   workload = []
+   for _ in range(operations):
+       if rng.random() < range_ratio:
+           workload.append((RANGE_QUERY, (rng.randint(18, 77),)))
+       else:
+           workload.append((POINT_QUERY, (rng.randint(1, rows),)))
+   return workload
+
+
+def run_sync(db_name, workload, concurrency):
+   ExecuteQuery = __import__("1-execute").ExecuteQuery
+   latencies = []
+   for query, params in workload:
+       start = time.perf_counter()
+       with ExecuteQuery(db_name, query, params):
+           pass
+       latencies.append(time.perf_counter() - start)
+   return latencies
+
+
+def run_decorator(db_name, workload, concurrency):
+   if DECORATORS_DIR not in sys.path:
+       sys.path.insert(0, DECORATORS_DIR)
+   module = __import__("1-with_db_connection")
+
+   @module.with_db_connection(db_name=db_name, reuse=True)
+   def execute(conn, query, params):
+       cursor = conn.cursor()
+       cursor.execute(query, params)
+       return cursor.fetchall()
+
+   latencies = []
+   try:
+       for query, params in workload:
+           start = time.perf_counter()
+           execute(query, params)
+           latencies.append(time.perf_counter() - start)
+   finally:
+       module.close_cached_connections()
+   return latencies
+
+
+def run_threaded(db_name, workload, concurrency):
+   DatabaseConnection = __import__("0-databaseconnection").DatabaseConnection
+   pool = ConnectionPool(db_name, size=concurrency)
+
+   def task(item):
+       query, params = item
+       start = time.perf_counter()
+       with DatabaseConnection(db_name, pool=pool) as conn:
+           conn.execute(query, params).fetchall()
+       return time.perf_counter() - start
+
+   try:
+       with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+           return list(executor.map(task, workload))
+   finally:
+       pool.close()
+
+
+def run_asyncio(db_name, workload, concurrency):
+   async def main():
+       async with AsyncConnectionPool(db_name, size=concurrency) as pool:
+           executor = QueryExecutor(pool)
+           items = iter(workload)
+           latencies = []
+
+           # ✅ `concurrency` workers pulling from one queue, like the thread pool
+           async def worker():
+               for query, params in items:
+                   start = time.perf_counter()
+                   await executor.fetchall(query, params)
+                   latencies.append(time.perf_counter() - start)
+
+           await asyncio.gather(*(worker() for _ in range(concurrency)))
+           return latencies
+
+   return asyncio.run(main())
+
+
+PATTERNS = {
+   "sync": (run_sync, False),
+   "decorator": (run_decorator, False),
+   "threaded": (run_threaded, True),
+   "asyncio": (run_asyncio, True),
+}
+
+
+def percentile(sorted_values, q):
+   if not sorted_values:
+       return 0.0
+   index = min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+   return sorted_values[index]
+
+
+def measure(runner, db_name, workload, concurrency, memory_operations):
+   start = time.perf_counter()
+   latencies = sorted(runner(db_name, workload, concurrency))
+   elapsed = time.perf_counter() - start
+
+   # ✅ Separate, shorter pass: tracemalloc would distort the timings above
+   tracemalloc.start()
+   runner(db_name, workload[:memory_operations], concurrency)
+   peak = tracemalloc.get_traced_memory()[1]
+   tracemalloc.stop()
+
+   return {
+       "operations": len(workload),
+       "seconds": round(elapsed, 6),
+       "throughput_ops": round(len(workload) / elapsed, 2),
+       "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+       "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+       "peak_memory_kib": round(peak / 1024, 1),
+   }
+
+
+def run_suite(args, db_name):
+   workload = build_workload(args.operations, args.rows, args.seed)
+   results = []
+   for name in args.patterns:
+       runner, concurrent_pattern = PATTERNS[name]
+       levels = args.concurrency if concurrent_pattern else [1]
+       for concurrency in levels:
+           result = {"pattern": name, "concurrency": concurrency}
+           result.update(measure(runner, db_name, workload, concurrency, args.memory_operations))
+           results.append(result)
+           print(f"{name:<10} c={concurrency:<3} {result['throughput_ops']:>10.0f} ops/s  "
+                 f"p50 {result['p50_ms']:>8.3f} ms  p99 {result['p99_ms']:>8.3f} ms  "
+                 f"peak {result['peak_memory_kib']:>8.1f} KiB", file=sys.stderr)
+   return {
+       "meta": {
+           "python": platform.python_version(),
+           "sqlite": sqlite3.sqlite_version,
+           "platform": platform.platform(),
+           "cpus": os.cpu_count(),
+           "rows": args.rows,
+           "operations": args.operations,
+           "seed": args.seed,
+       },
+       "results": results,
+   }
+
+
+def find_regressions(report, baseline, tolerance):
+   """Return descriptions of results whose throughput fell more than `tolerance`."""
+   previous = {(r["pattern"], r["concurrency"]): r for r in baseline["results"]}
+   regressions = []
+   for result in report["results"]:
+       before = previous.get((result["pattern"], result["concurrency"]))
+       if before and result["throughput_ops"] < before["throughput_ops"] * (1 - tolerance):
+           regressions.append(
+               f"{result['pattern']} c={result['concurrency']}: "
+               f"{before['throughput_ops']:.0f} -> {result['throughput_ops']:.0f} ops/s")
+   return regressions
+
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(
+       description="Run one seeded workload through the sync, decorator, threaded and asyncio "
+                   "access patterns and report throughput, p50/p99 latency and peak memory as "
+                   "JSON. With --compare, exit 1 if throughput fell more than --tolerance.")
+   parser.add_argument("--rows", type=int, default=100000)
+   parser.add_argument("--operations", type=int, default=5000)
+   parser.add_argument("--memory-operations", type=int, default=500)
+   parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+   parser.add_argument("--patterns", nargs="+", choices=list(PATTERNS), default=list(PATTERNS))
+   parser.add_argument("--seed", type=int, default=42)
+   parser.add_argument("--db", help="reuse this seeded database instead of a temporary one")
+   parser.add_argument("--output", help="write the JSON report here instead of stdout")
+   parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+   parser.add_argument("--tolerance", type=float, default=0.2)
+   args = parser.parse_args(argv)
+
+   if args.db:
+       if not os.path.exists(args.db):
+           seed_users(args.db, args.rows)
+       report = run_suite(args, args.db)
+   else:
+       with tempfile.TemporaryDirectory() as tmp:
+           db_name = os.path.join(tmp, "users.db")
+           seed_users(db_name, args.rows)
+           report = run_suite(args, db_name)
+
+   if args.output:
+       with open(args.output, "w") as f:
+           json.dump(report, f, indent=2)
+   else:
+       print(json.dumps(report, indent=2))
+
+   if args.compare:
+       with open(args.compare) as f:
+           regressions = find_regressions(report, json.load(f), args.tolerance)
+       for line in regressions:
+           print(f"REGRESSION {line}", file=sys.stderr)
+       return 1 if regressions else 0
+   return 0
+
+
+if __name__ == "__main__":
+   sys.exit(main())
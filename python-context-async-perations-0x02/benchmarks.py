@@ -0,0 +1,257 @@
+import os
+import time
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import threading
+import tracemalloc
+
+from db_profiles import PROFILES
+from connection_pool import ConnectionPool, ThreadLocalPool, ReadWriteRouter
+from async_pool import AsyncConnectionPool, QueryExecutor
+from process_offload import process_chunks, score_rows
+
+
+def seed_users(db_name, count):
+   """Create a `users` table in `db_name` holding `count` synthetic rows."""
+   conn = sqlite3.connect(db_name)
+   try:
+       conn.execute("DROP TABLE IF EXISTS users")
+       conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER)")
+       conn.executemany(
+           "INSERT INTO users (id, name, email, age) VALUES (?, ?, ?, ?)",
+           ((i, f"user{i}", f"user{i}@example.com", 18 + i % 60) for i in range(1, count + 1)),
+       )
+       conn.commit()
+   finally:
+       conn.close()
+
+
+def bench_profiles(tmp, args):
+   """Mixed read/write throughput with concurrent threads under each preset."""
+   DatabaseConnection = __import__("0-databaseconnection").DatabaseConnection
+   print(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10} {'errors':>7}  "
+         f"({args.readers} readers, {args.writers} writers, {args.duration}s)")
+   for name in PROFILES:
+       db_name = os.path.join(tmp, f"users-{name}.db")
+       seed_users(db_name, args.rows)
+       counts = {"reads": 0, "writes": 0, "errors": 0}
+       lock = threading.Lock()
+       deadline = time.monotonic() + args.duration
+
+       def reader(seed):
+           done = 0
+           with DatabaseConnection(db_name, profile=name) as conn:
+               while time.monotonic() < deadline:
+                   try:
+                       conn.execute("SELECT * FROM users WHERE id = ?",
+                                    ((seed + done * 7919) % args.rows + 1,)).fetchone()
+                       done += 1
+                   except sqlite3.OperationalError:
+                       with lock:
+                           counts["errors"] += 1
+           with lock:
+               counts["reads"] += done
+
+       def writer(seed):
+           done = 0
+           with DatabaseConnection(db_name, profile=name) as conn:
+               while time.monotonic() < deadline:
+                   try:
+                       conn.execute("UPDATE users SET age = age + 1 WHERE id = ?",
+                                    ((seed + done * 104729) % args.rows + 1,))
+                       conn.commit()
+                       done += 1
+                   except sqlite3.OperationalError:
+                       conn.rollback()
+                       with lock:
+                           counts["errors"] += 1
+           with lock:
+               counts["writes"] += done
+
+       threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+       threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+       for thread in threads:
+           thread.start()
+       for thread in threads:
+           thread.join()
+       print(f"{name:<10} {counts['reads'] / args.duration:>10.0f} "
+             f"{counts['writes'] / args.duration:>10.0f} {counts['errors']:>7}")
+
+
+def bench_streaming(tmp, args):
+   """Peak Python memory of ExecuteQuery with fetchall vs streaming."""
+   ExecuteQuery = __import__("1-execute").ExecuteQuery
+   db_name = os.path.join(tmp, "users.db")
+   seed_users(db_name, args.rows)
+   for stream in (False, True):
+       tracemalloc.start()
+       start = time.perf_counter()
+       with ExecuteQuery(db_name, "SELECT * FROM users WHERE age > ?", (25,), stream=stream) as rows:
+           count = sum(1 for _ in rows)
+       elapsed = time.perf_counter() - start
+       peak = tracemalloc.get_traced_memory()[1]
+       tracemalloc.stop()
+       label = "stream" if stream else "fetchall"
+       print(f"{label:<10} {count:>9} rows {elapsed:>8.3f}s  peak {peak / 1024:>10.0f} KiB")
+
+
+def bench_pool(tmp, args):
+   """Cost of a DatabaseConnection enter/exit plus a point lookup, pooled or not."""
+   DatabaseConnection = __import__("0-databaseconnection").DatabaseConnection
+   db_name = os.path.join(tmp, "users.db")
+   seed_users(db_name, args.rows)
+   calls = args.calls
+   pools = {
+       "no pool": None,
+       "shared pool": ConnectionPool(db_name, size=4, profile="balanced"),
+       "thread-local pool": ThreadLocalPool(db_name, profile="balanced"),
+   }
+   for label, pool in pools.items():
+       profile = "balanced" if pool is None else None
+       start = time.perf_counter()
+       for i in range(calls):
+           with DatabaseConnection(db_name, profile=profile, pool=pool) as conn:
+               conn.execute("SELECT * FROM users WHERE id = ?", (i % args.rows + 1,)).fetchone()
+       elapsed = time.perf_counter() - start
+       print(f"{label:<20} {elapsed / calls * 1e6:>10.2f} us/call  ({calls} calls)")
+       if pool is not None:
+           pool.close()
+
+
+def bench_async(tmp, args):
+   """Fan out range scans sequentially vs through pooled async executors."""
+   db_name = os.path.join(tmp, "users.db")
+   seed_users(db_name, args.rows)
+   queries = [("SELECT COUNT(*), AVG(age) FROM users WHERE age > ? AND name LIKE ?", (age % 60, "%1%"))
+              for age in range(args.queries)]
+
+   async def sequential():
+       async with AsyncConnectionPool(db_name, size=1) as pool:
+           executor = QueryExecutor(pool)
+           return [await executor.fetchall(query, params) for query, params in queries]
+
+   async def pooled(size):
+       async with AsyncConnectionPool(db_name, size=size) as pool:
+           return await QueryExecutor(pool).fetch_many(queries)
+
+   def run(label, coroutine_fn):
+       start = time.perf_counter()
+       asyncio.run(coroutine_fn())
+       elapsed = time.perf_counter() - start
+       print(f"{label:<20} {elapsed:>8.3f}s  {args.queries / elapsed:>8.1f} queries/s")
+       return elapsed
+
+   baseline = run("sequential", sequential)
+   for size in (2, 4, 8):
+       elapsed = run(f"pool of {size}", lambda: pooled(size))
+       print(f"{'':<20} speedup x{baseline / elapsed:.2f}")
+
+
+def bench_offload(tmp, args):
+   """Stream rows and score them inline vs in a process pool."""
+   ExecuteQuery = __import__("1-execute").ExecuteQuery
+   db_name = os.path.join(tmp, "users.db")
+   seed_users(db_name, args.rows)
+   query = "SELECT * FROM users"
+
+   start = time.perf_counter()
+   with ExecuteQuery(db_name, query, stream=True, chunk_size=500) as rows:
+       inline = score_rows(list(rows))
+   baseline = time.perf_counter() - start
+   print(f"{'inline':<20} {baseline:>8.3f}s")
+
+   for workers in (2, 4):
+       start = time.perf_counter()
+       query_ctx = ExecuteQuery(db_name, query, stream=True, chunk_size=500)
+       with query_ctx:
+           offloaded = [row for chunk in process_chunks(query_ctx.iter_chunks(), score_rows,
+                                                        max_workers=workers)
+                        for row in chunk]
+       elapsed = time.perf_counter() - start
+       assert offloaded == inline
+       print(f"{f'{workers} processes':<20} {elapsed:>8.3f}s  speedup x{baseline / elapsed:.2f}")
+
+
+def bench_routing(tmp, args):
+   """Mixed load through one shared pool vs read/write routing."""
+   DatabaseConnection = __import__("0-databaseconnection").DatabaseConnection
+   print(f"{'setup':<12} {'reads/s':>10} {'writes/s':>10} {'errors':>7}  "
+         f"({args.readers} readers, {args.writers} writers, {args.duration}s)")
+   for label in ("shared pool", "router"):
+       db_name = os.path.join(tmp, f"users-{label.replace(' ', '-')}.db")
+       seed_users(db_name, args.rows)
+       if label == "router":
+           router, pool = ReadWriteRouter(db_name, readers=args.readers), None
+       else:
+           router, pool = None, ConnectionPool(db_name, size=args.readers + args.writers,
+                                               profile="balanced")
+       counts = {"reads": 0, "writes": 0, "errors": 0}
+       lock = threading.Lock()
+       deadline = time.monotonic() + args.duration
+
+       def reader(seed):
+           done = 0
+           while time.monotonic() < deadline:
+               with DatabaseConnection(db_name, pool=pool, router=router) as conn:
+                   conn.execute("SELECT * FROM users WHERE id = ?",
+                                ((seed + done * 7919) % args.rows + 1,)).fetchone()
+               done += 1
+           with lock:
+               counts["reads"] += done
+
+       def writer(seed):
+           done = errors = 0
+           while time.monotonic() < deadline:
+               user_id = (seed + done * 104729) % args.rows + 1
+               try:
+                   with DatabaseConnection(db_name, pool=pool, router=router, mode="write") as conn:
+                       conn.execute("UPDATE users SET age = age + 1 WHERE id = ?", (user_id,))
+                       if router is None:
+                           conn.commit()
+                   done += 1
+               except sqlite3.OperationalError:
+                   errors += 1
+           with lock:
+               counts["writes"] += done
+               counts["errors"] += errors
+
+       threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+       threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+       for thread in threads:
+           thread.start()
+       for thread in threads:
+           thread.join()
+       (router or pool).close()
+       print(f"{label:<12} {counts['reads'] / args.duration:>10.0f} "
+             f"{counts['writes'] / args.duration:>10.0f} {counts['errors']:>7}")
+
+
+BENCHMARKS = {
+   "async": bench_async,
+   "offload": bench_offload,
+   "pool": bench_pool,
+   "profiles": bench_profiles,
+   "routing": bench_routing,
+   "streaming": bench_streaming,
+}
+
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Benchmarks for the SQLite context managers.")
+   parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+   parser.add_argument("--rows", type=int, default=10000)
+   parser.add_argument("--calls", type=int, default=10000)
+   parser.add_argument("--queries", type=int, default=64)
+   parser.add_argument("--readers", type=int, default=4)
+   parser.add_argument("--writers", type=int, default=1)
+   parser.add_argument("--duration", type=float, default=2.0)
+   args = parser.parse_args(argv)
+
+   with tempfile.TemporaryDirectory() as tmp:
+       BENCHMARKS[args.benchmark](tmp, args)
+
+
+if __name__ == "__main__":
+   main()
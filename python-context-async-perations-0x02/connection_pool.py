@@ -0,0 +1,221 @@
+import queue
+import pathlib
+import threading
+import concurrent.futures
+import contextlib
+import urllib.parse
+
+from db_profiles import connect, resolve_profile
+
+
+def reset_connection(conn):
+   """Undo per-use state so the next borrower gets a clean connection."""
+   if conn.in_transaction:
+       conn.rollback()
+   conn.row_factory = None
+
+
+class ConnectionPool:
+   """Shared pool of up to `size` connections to `db_name`.
+
+   Connections are opened lazily and handed out most-recently-used first,
+   so hot paths keep reusing the connection with the warmest page cache.
+   acquire() blocks for up to `timeout` seconds when all are in use.
+   """
+
+   def __init__(self, db_name, size=5, profile=None, timeout=None, **connect_kwargs):
+       self.db_name = db_name
+       self.size = size
+       self.profile = profile
+       self.timeout = timeout
+       self.connect_kwargs = connect_kwargs
+       self.idle = queue.LifoQueue()
+       self.created = 0
+       self.lock = threading.Lock()
+       self.closed = False
+
+   def _open(self):
+       return connect(self.db_name, self.profile, check_same_thread=False, **self.connect_kwargs)
+
+   def acquire(self):
+       if self.closed:
+           raise RuntimeError("Connection pool is closed")
+       try:
+           return self.idle.get_nowait()
+       except queue.Empty:
+           pass
+       with self.lock:
+           if self.created < self.size:
+               self.created += 1
+               try:
+                   return self._open()
+               except Exception:
+                   self.created -= 1
+                   raise
+       try:
+           return self.idle.get(timeout=self.timeout)
+       except queue.Empty:
+           raise TimeoutError(f"No connection available from pool for {self.db_name}") from None
+
+   def release(self, conn):
+       if self.closed:
+           conn.close()
+           return
+       try:
+           reset_connection(conn)
+       except Exception:
+           with self.lock:
+               self.created -= 1
+           conn.close()
+           return
+       self.idle.put(conn)
+
+   def close(self):
+       """Close idle connections; connections still borrowed close on release."""
+       self.closed = True
+       while True:
+           try:
+               self.idle.get_nowait().close()
+           except queue.Empty:
+               return
+
+
+class ThreadLocalPool:
+   """One long-lived connection per thread, reused by every borrow on it.
+
+   Nested borrows on one thread share the connection and its transaction;
+   it is only reset when the outermost borrow is released.
+   """
+
+   def __init__(self, db_name, profile=None, **connect_kwargs):
+       self.db_name = db_name
+       self.profile = profile
+       self.connect_kwargs = connect_kwargs
+       self.local = threading.local()
+       self.connections = []
+       self.lock = threading.Lock()
+
+   def acquire(self):
+       conn = getattr(self.local, "connection", None)
+       if conn is None:
+           conn = self.local.connection = connect(
+               self.db_name, self.profile, check_same_thread=False, **self.connect_kwargs)
+           with self.lock:
+               self.connections.append(conn)
+       self.local.depth = getattr(self.local, "depth", 0) + 1
+       return conn
+
+   def release(self, conn):
+       self.local.depth -= 1
+       if self.local.depth == 0:
+           reset_connection(conn)
+
+   def close(self):
+       with self.lock:
+           connections, self.connections = self.connections, []
+       for conn in connections:
+           conn.close()
+
+
+class WriteBuffer:
+   """Collects the statements of one write block for the writer thread."""
+
+   def __init__(self):
+       self.statements = []
+
+   def execute(self, query, params=()):
+       self.statements.append((False, query, params))
+
+   def executemany(self, query, seq_of_params):
+       self.statements.append((True, query, list(seq_of_params)))
+
+   def apply(self, conn):
+       for many, query, params in self.statements:
+           if many:
+               conn.executemany(query, params)
+           else:
+               conn.execute(query, params)
+       return len(self.statements)
+
+
+class ReadWriteRouter:
+   """Send reads to read-only connections and writes to one writer thread.
+
+   In WAL mode SQLite serves any number of readers alongside a single
+   writer. Readers borrow from a ConnectionPool of `mode=ro` URI
+   connections; writes are queued to a dedicated thread owning the only
+   read-write connection, so writers never contend for the lock.
+   """
+
+   def __init__(self, db_name, readers=4, profile="balanced", timeout=None):
+       settings = dict(resolve_profile(profile))
+       settings.setdefault("journal_mode", "WAL")
+       self.writer = connect(db_name, settings, check_same_thread=False)
+       settings.pop("journal_mode")
+       path = urllib.parse.quote(pathlib.Path(db_name).resolve().as_posix())
+       self.readers = ConnectionPool(f"file:{path}?mode=ro", size=readers, profile=settings,
+                                     timeout=timeout, uri=True)
+       self.queue = queue.Queue()
+       self.lock = threading.Lock()
+       self.closed = False
+       self.thread = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+       self.thread.start()
+
+   def _write_loop(self):
+       while True:
+           item = self.queue.get()
+           if item is None:
+               return
+           func, future = item
+           if not future.set_running_or_notify_cancel():
+               continue
+           try:
+               result = func(self.writer)
+               self.writer.commit()
+           except BaseException as e:
+               self.writer.rollback()
+               future.set_exception(e)
+           else:
+               future.set_result(result)
+
+   def submit(self, func):
+       """Queue `func(conn)` to run in its own transaction on the writer; returns a Future."""
+       future = concurrent.futures.Future()
+       with self.lock:
+           if self.closed:
+               raise RuntimeError("Read/write router is closed")
+           self.queue.put((func, future))
+       return future
+
+   @contextlib.contextmanager
+   def read(self):
+       conn = self.readers.acquire()
+       try:
+           yield conn
+       finally:
+           self.readers.release(conn)
+
+   def close(self):
+       """Finish the writes queued so far, then stop the writer and close everything."""
+       with self.lock:
+           if self.closed:
+               return
+           self.closed = True
+           self.queue.put(None)
+       self.thread.join()
+       # ✅ Nothing may be left behind the sentinel, but never leave a caller waiting forever
+       while True:
+           try:
+               item = self.queue.get_nowait()
+           except queue.Empty:
+               break
+           if item is not None and item[1].set_running_or_notify_cancel():
+               item[1].set_exception(RuntimeError("Read/write router is closed"))
+       self.writer.close()
+       self.readers.close()
+
+   def __enter__(self):
+       return self
+
+   def __exit__(self, exc_type, exc_val, exc_tb):
+       self.close()
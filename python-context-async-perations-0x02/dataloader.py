@@ -0,0 +1,81 @@
+import asyncio
+
+
+class RowLoader:
+   """Coalesce concurrent by-key lookups into one `WHERE key IN (...)` query.
+
+   Every load() made during the same event-loop tick is queued; the batch
+   is dispatched once the loop gets back to its callbacks, as a single
+   query (split into chunks of `max_batch_size` keys), and each caller's
+   future is resolved with its row, or None when the key does not exist.
+   With `cache=True` keys already loaded are served without a query.
+
+   Each caller gets its own shielded view of the shared future, so one
+   caller cancelling or timing out does not cancel the load for the
+   others; failed loads are not cached.
+   """
+
+   def __init__(self, executor, table="users", key="id", max_batch_size=500, cache=True):
+       if not table.isidentifier() or not key.isidentifier():
+           raise ValueError("table and key must be plain identifiers")
+       self.executor = executor
+       self.table = table
+       self.key = key
+       self.max_batch_size = max_batch_size
+       self.cache = {} if cache else None
+       self.pending = {}
+       self.batches = 0
+
+   def load(self, key):
+       """Return an awaitable resolving to the row whose key column equals `key`."""
+       if self.cache is not None and key in self.cache:
+           future = self.cache[key]
+           if not future.done() or (not future.cancelled() and future.exception() is None):
+               return asyncio.shield(future)
+           del self.cache[key]
+       future = self.pending.get(key)
+       if future is None:
+           loop = asyncio.get_running_loop()
+           if not self.pending:
+               loop.call_soon(self._dispatch)
+           future = self.pending[key] = loop.create_future()
+           if self.cache is not None:
+               self.cache[key] = future
+       return asyncio.shield(future)
+
+   async def load_many(self, keys):
+       return await asyncio.gather(*(self.load(key) for key in keys))
+
+   def clear(self, key=None):
+       """Forget cached rows, all of them or just `key`."""
+       if self.cache is None:
+           return
+       if key is None:
+           self.cache.clear()
+       else:
+           self.cache.pop(key, None)
+
+   def _dispatch(self):
+       pending, self.pending = self.pending, {}
+       keys = list(pending)
+       for start in range(0, len(keys), self.max_batch_size):
+           chunk = {key: pending[key] for key in keys[start:start + self.max_batch_size]}
+           asyncio.ensure_future(self._fetch(chunk))
+
+   async def _fetch(self, futures):
+       self.batches += 1
+       placeholders = ", ".join("?" * len(futures))
+       query = f"SELECT {self.key}, * FROM {self.table} WHERE {self.key} IN ({placeholders})"
+       try:
+           rows = await self.executor.fetchall(query, tuple(futures))
+       except Exception as e:
+           for key, future in futures.items():
+               if self.cache is not None:
+                   self.cache.pop(key, None)
+               if not future.done():
+                   future.set_exception(e)
+           return
+       found = {row[0]: row[1:] for row in rows}
+       for key, future in futures.items():
+           if not future.done():
+               future.set_result(found.get(key))
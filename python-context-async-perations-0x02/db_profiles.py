@@ -0,0 +1,64 @@
+import sqlite3
+
+
+# ✅ Named PRAGMA presets; values are applied in order on every new connection
+PROFILES = {
+   "default": {},
+   "durable": {
+       "journal_mode": "WAL",
+       "synchronous": "FULL",
+       "busy_timeout": 5000,
+   },
+   "balanced": {
+       "journal_mode": "WAL",
+       "synchronous": "NORMAL",
+       "cache_size": -65536,
+       "mmap_size": 268435456,
+       "temp_store": "MEMORY",
+       "busy_timeout": 5000,
+   },
+   "fast": {
+       "journal_mode": "WAL",
+       "synchronous": "OFF",
+       "cache_size": -262144,
+       "mmap_size": 1073741824,
+       "temp_store": "MEMORY",
+       "busy_timeout": 10000,
+   },
+}
+
+
+def resolve_profile(profile):
+   """Return the PRAGMA mapping for a preset name, a mapping, or None."""
+   if profile is None:
+       return {}
+   if isinstance(profile, str):
+       try:
+           return PROFILES[profile]
+       except KeyError:
+           raise ValueError(f"Unknown connection profile: {profile!r}") from None
+   return dict(profile)
+
+
+def pragma_statements(profile):
+   """Return the validated `PRAGMA name = value` statements for `profile`."""
+   statements = []
+   for pragma, value in resolve_profile(profile).items():
+       if not pragma.isidentifier():
+           raise ValueError(f"Invalid pragma name: {pragma!r}")
+       if not isinstance(value, int) and not str(value).isidentifier():
+           raise ValueError(f"Invalid value for pragma {pragma}: {value!r}")
+       statements.append(f"PRAGMA {pragma} = {value}")
+   return statements
+
+
+def apply_profile(conn, profile):
+   """Run the profile's PRAGMA statements on `conn` and return it."""
+   for statement in pragma_statements(profile):
+       conn.execute(statement)
+   return conn
+
+
+def connect(db_name, profile=None, **kwargs):
+   """sqlite3.connect() followed by apply_profile()."""
+   return apply_profile(sqlite3.connect(db_name, **kwargs), profile)
@@ -0,0 +1,64 @@
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import os
+
+
+def process_chunks(chunks, func, max_workers=None, max_in_flight=None, executor=None):
+   """Yield `func(chunk)` for each chunk, computed in a process pool, in input order.
+
+   At most `max_in_flight` chunks (default: twice the worker count) are
+   submitted but not yet yielded, so a fast reader cannot pile the whole
+   result set into the pool's queue. `func` must be picklable (a module
+   level function). Pass `executor` to reuse an existing pool.
+   """
+   own_executor = executor is None
+   if own_executor:
+       executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+   limit = max_in_flight or 2 * (max_workers or os.cpu_count() or 1)
+   in_flight = collections.deque()
+   try:
+       for chunk in chunks:
+           in_flight.append(executor.submit(func, chunk))
+           if len(in_flight) >= limit:
+               yield in_flight.popleft().result()
+       while in_flight:
+           yield in_flight.popleft().result()
+   finally:
+       for future in in_flight:
+           future.cancel()
+       if own_executor:
+           executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def aprocess_chunks(chunks, func, executor, max_in_flight=None):
+   """Async counterpart of process_chunks() for an async iterable of chunks.
+
+   The event loop keeps reading the next chunk while earlier ones are
+   transformed in `executor`; results are yielded in input order.
+   """
+   loop = asyncio.get_running_loop()
+   limit = max_in_flight or 2 * (os.cpu_count() or 1)
+   in_flight = collections.deque()
+   try:
+       async for chunk in chunks:
+           in_flight.append(loop.run_in_executor(executor, func, chunk))
+           if len(in_flight) >= limit:
+               yield await in_flight.popleft()
+       while in_flight:
+           yield await in_flight.popleft()
+   finally:
+       for future in in_flight:
+           future.cancel()
+
+
+def score_rows(rows, rounds=200):
+   """Example CPU-bound transform: derive a stable score for each row."""
+   scored = []
+   for row in rows:
+       digest = repr(row).encode()
+       for _ in range(rounds):
+           digest = hashlib.sha256(digest).digest()
+       scored.append((row[0], int.from_bytes(digest[:4], "big")))
+   return scored
@@ -0,0 +1,207 @@
+import os
+import re
+import ast
+import time
+import sqlite3
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GENERATORS_DIR = os.path.join(HERE, "..", "python-generators-0x00")
+
+# ✅ Modules whose SQL string literals are inspected, per backend
+SQLITE_MODULES = [os.path.join(HERE, name) for name in ("1-execute.py", "3-concurrent.py")]
+MYSQL_MODULES = [os.path.join(GENERATORS_DIR, name)
+                 for name in ("0-stream_users.py", "1-batch_processing.py",
+                              "2-lazy_paginate.py", "4-stream_ages.py")]
+
+_SQL_START = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.IGNORECASE)
+_FROM = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+_SELECT_LIST = re.compile(r"^\s*SELECT\s+(.*?)\s+FROM\b", re.IGNORECASE | re.DOTALL)
+_WHERE = re.compile(r"\bWHERE\s+(.*?)(?:\bORDER\b|\bGROUP\b|\bLIMIT\b|$)", re.IGNORECASE | re.DOTALL)
+_PREDICATE = re.compile(r"(\w+)\s*(=|>=|<=|>|<|\bIN\b|\bLIKE\b|\bBETWEEN\b)", re.IGNORECASE)
+
+
+def find_queries(paths):
+   """Return (path, query) for every SQL string literal in the given modules."""
+   found = []
+   for path in paths:
+       if not os.path.exists(path):
+           continue
+       with open(path) as f:
+           tree = ast.parse(f.read(), filename=path)
+       for node in ast.walk(tree):
+           if isinstance(node, ast.Constant) and isinstance(node.value, str):
+               if _SQL_START.match(node.value) and _FROM.search(node.value):
+                   found.append((os.path.basename(path), node.value.strip()))
+   return list(dict.fromkeys(found))
+
+
+def sample_params(query, value=25):
+   return (value,) * query.count("?")
+
+
+def propose_index(query):
+   """Return (table, columns) for an index serving `query`, or None.
+
+   Equality columns come first, then range columns; when the select list
+   is explicit its columns are appended so the index also covers the read.
+   """
+   table = _FROM.search(query)
+   where = _WHERE.search(query)
+   if not table or not where:
+       return None
+   equality, ranges = [], []
+   for column, operator in _PREDICATE.findall(where.group(1)):
+       if column.upper() in ("AND", "OR", "NOT"):
+           continue
+       target = equality if operator in ("=", "IN", "in") else ranges
+       if column not in equality + ranges:
+           target.append(column)
+   columns = equality + ranges
+   if not columns:
+       return None
+   select_list = _SELECT_LIST.search(query)
+   if select_list and select_list.group(1).strip() != "*":
+       for column in (c.strip() for c in select_list.group(1).split(",")):
+           if column.isidentifier() and column.lower() not in ("id", "rowid") and column not in columns:
+               columns.append(column)
+   return table.group(1), columns
+
+
+def index_sql(table, columns):
+   return f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
+
+
+def explain_sqlite(conn, query):
+   """Return the EXPLAIN QUERY PLAN detail lines for `query`."""
+   rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", sample_params(query)).fetchall()
+   return [row[-1] for row in rows]
+
+
+def is_full_scan(details):
+   return any(line.startswith("SCAN") and "INDEX" not in line for line in details)
+
+
+def time_query(conn, query, repeat=5):
+   """Best of `repeat` wall-clock runs, in milliseconds."""
+   best = float("inf")
+   for _ in range(repeat):
+       start = time.perf_counter()
+       conn.execute(query, sample_params(query)).fetchall()
+       best = min(best, time.perf_counter() - start)
+   return best * 1000
+
+
+def advise_sqlite(db_name, paths=SQLITE_MODULES, create=False):
+   """Explain each query, flag full scans and (optionally) create indexes.
+
+   Returns one dict per query with its plan, the proposed index and, when
+   `create` is true, before/after timings and the plan after indexing. An
+   index that does not make its query faster is dropped again.
+   """
+   # ✅ No statement cache: a cached EXPLAIN is not re-planned after CREATE/DROP INDEX
+   conn = sqlite3.connect(db_name, cached_statements=0)
+   report = []
+   try:
+       for source, query in find_queries(paths):
+           entry = {"source": source, "query": query}
+           try:
+               entry["plan"] = explain_sqlite(conn, query)
+           except sqlite3.Error as e:
+               entry["error"] = str(e)
+               report.append(entry)
+               continue
+           entry["full_scan"] = is_full_scan(entry["plan"])
+           proposal = propose_index(query) if entry["full_scan"] else None
+           entry["proposed_index"] = index_sql(*proposal) if proposal else None
+           if create and proposal:
+               entry["before_ms"] = time_query(conn, query)
+               conn.execute(entry["proposed_index"])
+               conn.execute("ANALYZE")
+               conn.commit()
+               entry["after_ms"] = time_query(conn, query)
+               entry["plan_after"] = explain_sqlite(conn, query)
+               # ✅ Low-selectivity filters can read faster as a scan; don't keep a loser
+               entry["kept"] = entry["after_ms"] < entry["before_ms"]
+               if not entry["kept"]:
+                   name = entry["proposed_index"].split()[5]
+                   conn.execute(f"DROP INDEX {name}")
+                   conn.commit()
+           report.append(entry)
+   finally:
+       conn.close()
+   return report
+
+
+def advise_mysql(connection, paths=MYSQL_MODULES):
+   """Run MySQL EXPLAIN over the queries and flag `type = ALL` table scans."""
+   report = []
+   cursor = connection.cursor(dictionary=True)
+   try:
+       for source, query in find_queries(paths):
+           params = (25,) * query.count("%s")
+           cursor.execute(f"EXPLAIN {query}", params)
+           plan = cursor.fetchall()
+           full_scan = any(row.get("type") == "ALL" for row in plan)
+           proposal = propose_index(query.replace("%s", "?")) if full_scan else None
+           report.append({
+               "source": source,
+               "query": query,
+               "plan": plan,
+               "full_scan": full_scan,
+               "proposed_index": index_sql(*proposal).replace(" IF NOT EXISTS", "") if proposal else None,
+           })
+   finally:
+       cursor.close()
+   return report
+
+
+def print_report(report):
+   for entry in report:
+       print(f"[{entry['source']}] {entry['query']}")
+       if "error" in entry:
+           print(f"   error: {entry['error']}")
+           continue
+       for line in entry["plan"]:
+           print(f"   plan: {line}")
+       if entry["full_scan"]:
+           print("   ⚠ full table scan" if _WHERE.search(entry["query"])
+                 else "   full table scan (no WHERE clause, expected)")
+       if entry.get("proposed_index"):
+           print(f"   proposed: {entry['proposed_index']}")
+       if "after_ms" in entry:
+           verdict = "kept" if entry["kept"] else "dropped, slower than the scan"
+           print(f"   before {entry['before_ms']:.3f} ms -> after {entry['after_ms']:.3f} ms ({verdict})")
+           for line in entry["plan_after"]:
+               print(f"   plan after: {line}")
+
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Explain the registered queries and suggest indexes.")
+   parser.add_argument("--db", default="users.db")
+   parser.add_argument("--create", action="store_true", help="create proposed indexes and time them")
+   parser.add_argument("--mysql", action="store_true", help="also EXPLAIN the user_data queries on MySQL")
+   parser.add_argument("--mysql-host", default="localhost")
+   parser.add_argument("--mysql-user", default="root")
+   parser.add_argument("--mysql-database", default="ALX_prodev")
+   args = parser.parse_args(argv)
+
+   print_report(advise_sqlite(args.db, create=args.create))
+
+   if args.mysql:
+       import mysql.connector
+
+       connection = mysql.connector.connect(
+           host=args.mysql_host,
+           user=args.mysql_user,
+           password=os.environ.get("MYSQL_PASSWORD", ""),
+           database=args.mysql_database,
+       )
+       try:
+           print_report(advise_mysql(connection))
+       finally:
+           connection.close()
+
+
+if __name__ == "__main__":
+   main()
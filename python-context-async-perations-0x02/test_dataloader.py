@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from dataloader import RowLoader
+
+
+class FakeExecutor:
+   """Answers RowLoader queries after `delay`, failing the first `failures` calls."""
+
+   def __init__(self, delay=0.05, failures=0):
+       self.delay = delay
+       self.failures = failures
+       self.calls = 0
+
+   async def fetchall(self, query, params):
+       self.calls += 1
+       await asyncio.sleep(self.delay)
+       if self.calls <= self.failures:
+           raise RuntimeError("database is locked")
+       return [(key, f"user{key}") for key in params]
+
+
+class TestRowLoader(unittest.TestCase):
+
+   def test_cancelled_caller_does_not_cancel_others(self):
+       async def run():
+           executor = FakeExecutor()
+           loader = RowLoader(executor)
+           waiting = asyncio.ensure_future(loader.load(1))
+           with self.assertRaises(asyncio.TimeoutError):
+               await asyncio.wait_for(loader.load(1), 0.001)
+           self.assertEqual(await waiting, ("user1",))
+           self.assertEqual(await loader.load(1), ("user1",))
+           self.assertEqual(executor.calls, 1)
+
+       asyncio.run(run())
+
+   def test_failed_load_is_not_cached(self):
+       async def run():
+           executor = FakeExecutor(delay=0, failures=1)
+           loader = RowLoader(executor)
+           with self.assertRaises(RuntimeError):
+               await loader.load(1)
+           self.assertEqual(await loader.load(1), ("user1",))
+           self.assertEqual(executor.calls, 2)
+
+       asyncio.run(run())
+
+
+if __name__ == "__main__":
+   unittest.main()
@@ -1,17 +1,97 @@
-from datetime import datetime
+import sys
+import json
+import time
+import queue
+import atexit
+import random
 import sqlite3
+import logging
 import functools
+import logging.handlers
 
+from query_utils import fingerprint
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format query records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {"ts": round(record.created, 6), "level": record.levelname}
+        entry.update(getattr(record, "query_info", {"message": record.getMessage()}))
+        return json.dumps(entry, default=str)
+
+
+query_logger = logging.getLogger("queries")
+query_logger.setLevel(logging.INFO)
+query_logger.propagate = False
+_listener = None
+
+
+def start_query_logging(stream=None):
+    """Route `query_logger` through a queue so callers never block on I/O.
+
+    Records are enqueued on the calling thread and formatted/written by a
+    background listener thread. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    log_queue = queue.SimpleQueue()
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonLinesFormatter())
+    query_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+    atexit.register(stop_query_logging)
+    return _listener
+
+
+def stop_query_logging():
+    """Flush pending records and stop the background listener."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in list(query_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            query_logger.removeHandler(handler)
+    _listener = None
+
+
+def log_queries(sample_rate=1.0, slow_threshold=None, logger=query_logger):
+    """Log each query as a JSON line with fingerprint, duration, rows and caller.
+
+    `sample_rate` is the fraction of calls emitted. With `slow_threshold`
+    (seconds) set, only calls at least that slow are emitted, regardless
+    of sampling.
+    """
+    if logger is query_logger:
+        start_query_logging()
 
-def log_queries():
     def decorator_log_queries(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             query = kwargs.get('query') or (args[0] if args else None)
-            if query:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                print(f"[{timestamp}] Executing SQL Query: {query}")
-            return func(*args, **kwargs)
+            if not query or not logger.isEnabledFor(logging.INFO):
+                return func(*args, **kwargs)
+            sampled = sample_rate >= 1.0 or random.random() < sample_rate
+            if slow_threshold is None and not sampled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter() - start
+            if slow_threshold is not None and duration < slow_threshold:
+                return result
+            caller = sys._getframe(1)
+            logger.info("query", extra={"query_info": {
+                "query": query,
+                "fingerprint": fingerprint(query),
+                "duration_ms": round(duration * 1000, 3),
+                "rows": len(result) if isinstance(result, (list, tuple)) else None,
+                "caller": f"{caller.f_code.co_filename}:{caller.f_lineno}",
+                "function": func.__qualname__,
+            }})
+            return result
         return wrapper
     return decorator_log_queries
 
@@ -26,5 +106,6 @@ def fetch_all_users(query):
     return results
 
 
-users = fetch_all_users(query="SELECT * FROM users")
-print(users)
\ No newline at end of file
+if __name__ == "__main__":
+    users = fetch_all_users(query="SELECT * FROM users")
+    print(users)
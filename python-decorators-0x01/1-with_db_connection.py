@@ -1,26 +1,72 @@
 import sqlite3
 import functools
+import threading
 
+import query_metrics
+from db_connect import connect as profiled_connect, profile_key
 
-def with_db_connection(func):
-   @functools.wraps(func)
-   def wrapper(*args, **kwargs):
-       conn = sqlite3.connect('users.db')
-       try:
-           result = func(conn, *args, **kwargs)
-           return result
-       finally:
-           conn.close()
-   return wrapper
 
+# ✅ Per-thread warm connections so SQLite's statement cache survives between calls
+_local = threading.local()
 
-@with_db_connection
+
+def _cached_connection(db_name, cached_statements, profile=None):
+   connections = _local.__dict__.setdefault("connections", {})
+   key = (db_name, profile_key(profile))
+   conn = connections.get(key)
+   if conn is None:
+       conn = connections[key] = profiled_connect(db_name, profile, cached_statements=cached_statements)
+   return conn
+
+
+def close_cached_connections():
+   """Close the calling thread's reused connections."""
+   for conn in _local.__dict__.pop("connections", {}).values():
+       conn.close()
+
+
+def with_db_connection(func=None, *, db_name='users.db', reuse=False, cached_statements=128,
+                       profile=None):
+   """Pass a connection to `func` as its first argument.
+
+   By default a fresh connection is opened and closed per call. With
+   `reuse=True` each thread keeps one connection per database open, sized
+   to hold `cached_statements` prepared statements; uncommitted work is
+   rolled back after each call, matching what closing would have done.
+   `profile` is a db_connect.PROFILES preset name or PRAGMA mapping
+   applied to each new connection.
+   """
+   def decorator(func):
+       @functools.wraps(func)
+       def wrapper(*args, **kwargs):
+           if reuse:
+               connect = lambda: _cached_connection(db_name, cached_statements, profile)
+           else:
+               connect = lambda: profiled_connect(db_name, profile, cached_statements=cached_statements)
+           conn, handle = query_metrics.connect(connect, func.__qualname__)
+           try:
+               result = func(handle, *args, **kwargs)
+               return result
+           finally:
+               if not reuse:
+                   conn.close()
+               elif conn.in_transaction:
+                   conn.rollback()
+       return wrapper
+
+   if func is not None:
+       return decorator(func)
+   return decorator
+
+
+@with_db_connection(reuse=True)
 def get_user_by_id(conn, user_id):
    cursor = conn.cursor()
    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
    return cursor.fetchone()
 
 
-#### Fetch user by ID with automatic connection handling
-user = get_user_by_id(user_id=1)
-print(user)
\ No newline at end of file
+if __name__ == "__main__":
+   #### Fetch user by ID with automatic connection handling
+   user = get_user_by_id(user_id=1)
+   print(user)
@@ -1,11 +1,26 @@
+import time
 import sqlite3
 import functools
+import threading
+
+from db_connect import connect
+
+
+# ✅ Batch currently open on this thread, if any
+_local = threading.local()
+
+
+def current_batch():
+   return getattr(_local, "batch", None)
 
 
 # ✅ Decorator to open and close DB connection
 def with_db_connection(func):
    @functools.wraps(func)
    def wrapper(*args, **kwargs):
+       batch = current_batch()
+       if batch is not None:
+           return func(batch.conn, *args, **kwargs)
        conn = sqlite3.connect('users.db')
        try:
            return func(conn, *args, **kwargs)
@@ -14,10 +29,81 @@ def with_db_connection(func):
    return wrapper
 
 
+class batch_transaction:
+   """Group the @transactional calls made inside the block into few commits.
+
+   Calls share one connection and commit together once `max_statements`
+   calls have succeeded or `max_interval` seconds have passed since the
+   group started, and once more on exit. Each call runs under its own
+   SAVEPOINT, so a failing call is rolled back (and re-raised) without
+   losing the rest of the group. Leaving the block with an exception rolls
+   back the uncommitted group. `profile` is a db_connect.PROFILES preset name
+   or PRAGMA mapping for the shared connection.
+   """
+
+   def __init__(self, db_name='users.db', max_statements=500, max_interval=1.0, profile=None):
+       self.db_name = db_name
+       self.profile = profile
+       self.max_statements = max_statements
+       self.max_interval = max_interval
+       self.conn = None
+       self.pending = 0
+       self.started = None
+       self.commits = 0
+       self.failed = 0
+
+   def __enter__(self):
+       if current_batch() is not None:
+           raise RuntimeError("batch_transaction blocks cannot be nested")
+       self.conn = connect(self.db_name, self.profile)
+       _local.batch = self
+       return self
+
+   def __exit__(self, exc_type, exc_val, exc_tb):
+       _local.batch = None
+       try:
+           if exc_type:
+               self.conn.rollback()
+           else:
+               self.flush()
+       finally:
+           self.conn.close()
+
+   def run(self, func, *args, **kwargs):
+       if not self.conn.in_transaction:
+           self.conn.execute("BEGIN")
+           self.started = time.monotonic()
+       self.conn.execute("SAVEPOINT batch_item")
+       try:
+           result = func(self.conn, *args, **kwargs)
+       except Exception as e:
+           self.conn.execute("ROLLBACK TO batch_item")
+           self.conn.execute("RELEASE batch_item")
+           self.failed += 1
+           print(f"[ERROR] Statement rolled back, batch kept, due to: {e}")
+           raise
+       self.conn.execute("RELEASE batch_item")
+       self.pending += 1
+       if (self.pending >= self.max_statements
+               or time.monotonic() - self.started >= self.max_interval):
+           self.flush()
+       return result
+
+   def flush(self):
+       """Commit every call made since the last commit."""
+       if self.conn.in_transaction:
+           self.conn.commit()
+           self.commits += 1
+       self.pending = 0
+
+
 # ✅ Decorator to handle transactions
 def transactional(func):
    @functools.wraps(func)
    def wrapper(conn, *args, **kwargs):
+       batch = current_batch()
+       if batch is not None and batch.conn is conn:
+           return batch.run(func, *args, **kwargs)
        try:
            result = func(conn, *args, **kwargs)
            conn.commit()
@@ -36,5 +122,6 @@ def update_user_email(conn, user_id, new_email):
    cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
 
 
-# ✅ Update user's email with automatic transaction handling
-update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
\ No newline at end of file
+if __name__ == "__main__":
+   # ✅ Update user's email with automatic transaction handling
+   update_user_email(user_id=1, new_email='Crawford_Cartwright@hotmail.com')
@@ -1,6 +1,8 @@
 import time
+import random
 import sqlite3
 import functools
+import threading
 
 
 # ✅ Decorator to manage DB connection
@@ -15,22 +17,199 @@ def with_db_connection(func):
    return wrapper
 
 
+# ✅ Errors worth retrying: SQLite lock/busy contention and dropped connections
+TRANSIENT_MESSAGES = ("database is locked", "database is busy", "unable to open database")
+
+
+def is_transient(exc):
+   """Return True if `exc` looks like a transient DB error worth retrying."""
+   if isinstance(exc, sqlite3.OperationalError):
+       message = str(exc).lower()
+       return any(text in message for text in TRANSIENT_MESSAGES)
+   return isinstance(exc, (ConnectionError, TimeoutError))
+
+
+class RetryBudget:
+   """Process-wide token bucket limiting how many retries may be spent.
+
+   Every retry takes one token; tokens refill at `refill_rate` per second up
+   to `capacity`. When the bucket is empty callers fail immediately instead
+   of piling more load onto a struggling database.
+   """
+
+   def __init__(self, capacity=20, refill_rate=2.0):
+       self.capacity = capacity
+       self.refill_rate = refill_rate
+       self.tokens = float(capacity)
+       self.updated = time.monotonic()
+       self.lock = threading.Lock()
+
+   def try_acquire(self):
+       with self.lock:
+           now = time.monotonic()
+           self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+           self.updated = now
+           if self.tokens >= 1:
+               self.tokens -= 1
+               return True
+           return False
+
+
+class CircuitOpenError(Exception):
+   """Raised when the circuit breaker is open and calls fail fast."""
+
+
+class CircuitBreaker:
+   """Fail fast after `failure_threshold` consecutive failures.
+
+   The breaker stays open for `reset_timeout` seconds, then lets a single
+   trial call through (half-open); success closes it, failure re-opens it.
+   """
+
+   def __init__(self, failure_threshold=5, reset_timeout=30.0):
+       self.failure_threshold = failure_threshold
+       self.reset_timeout = reset_timeout
+       self.failures = 0
+       self.opened_at = None
+       self.half_open = False
+       self.lock = threading.Lock()
+
+   @property
+   def state(self):
+       if self.opened_at is None:
+           return "closed"
+       if self.half_open or time.monotonic() - self.opened_at >= self.reset_timeout:
+           return "half-open"
+       return "open"
+
+   def before_call(self):
+       with self.lock:
+           if self.opened_at is None:
+               return
+           if self.half_open or time.monotonic() - self.opened_at < self.reset_timeout:
+               raise CircuitOpenError("Circuit open: database considered unavailable")
+           self.half_open = True
+
+   def record_success(self):
+       with self.lock:
+           self.failures = 0
+           self.opened_at = None
+           self.half_open = False
+
+   def record_failure(self):
+       with self.lock:
+           self.failures += 1
+           if self.half_open or self.failures >= self.failure_threshold:
+               self.opened_at = time.monotonic()
+               self.half_open = False
+
+
+class RetryMetrics:
+   """Counters describing retry behaviour, shared by all decorated functions."""
+
+   def __init__(self):
+       self.lock = threading.Lock()
+       self.reset()
+
+   def reset(self):
+       self.calls = 0
+       self.attempts = 0
+       self.retries = 0
+       self.failures = 0
+       self.budget_exhausted = 0
+       self.circuit_rejections = 0
+       self.time_retrying = 0.0
+
+   def record(self, **increments):
+       with self.lock:
+           for name, value in increments.items():
+               setattr(self, name, getattr(self, name) + value)
+
+   def snapshot(self):
+       with self.lock:
+           return {
+               "calls": self.calls,
+               "attempts": self.attempts,
+               "retries": self.retries,
+               "failures": self.failures,
+               "budget_exhausted": self.budget_exhausted,
+               "circuit_rejections": self.circuit_rejections,
+               "time_retrying": self.time_retrying,
+           }
+
+
+retry_budget = RetryBudget()
+retry_metrics = RetryMetrics()
+
+
+def compute_delay(attempt, delay, max_delay, backoff, jitter, previous):
+   """Return how long to sleep before retry number `attempt` (1-based).
+
+   `jitter` is None (plain exponential), "full" (uniform in [0, backoff
+   delay]) or "decorrelated" (uniform in [delay, previous * 3]).
+   """
+   if jitter == "decorrelated":
+       return min(max_delay, random.uniform(delay, max(delay, previous * 3)))
+   ceiling = min(max_delay, delay * backoff ** (attempt - 1))
+   if jitter == "full":
+       return random.uniform(0, ceiling)
+   return ceiling
+
+
 # ✅ Decorator to retry on failure
-def retry_on_failure(retries=3, delay=2):
+def retry_on_failure(retries=3, delay=2, max_delay=30, backoff=2, jitter="full",
+                     retry_on=is_transient, budget=retry_budget, breaker=None,
+                     metrics=retry_metrics):
+   if jitter not in (None, "full", "decorrelated"):
+       raise ValueError(f"Unknown jitter mode: {jitter!r}")
+
    def decorator(func):
        @functools.wraps(func)
        def wrapper(*args, **kwargs):
            attempt = 0
+           sleep_for = delay
+           metrics.record(calls=1)
            while attempt < retries:
+               if breaker is not None:
+                   try:
+                       breaker.before_call()
+                   except CircuitOpenError:
+                       metrics.record(circuit_rejections=1, failures=1)
+                       raise
+               metrics.record(attempts=1)
                try:
-                   return func(*args, **kwargs)
+                   result = func(*args, **kwargs)
                except Exception as e:
                    attempt += 1
+                   if not retry_on(e):
+                       # ✅ The database answered; an application error says nothing about its health
+                       if breaker is not None:
+                           breaker.record_success()
+                       metrics.record(failures=1)
+                       raise
+                   if breaker is not None:
+                       breaker.record_failure()
                    print(f"[Retry {attempt}] Failed due to: {e}")
                    if attempt == retries:
                        print("[ERROR] Max retries reached. Operation failed.")
+                       metrics.record(failures=1)
+                       raise
+                   # ✅ This failure opened the breaker: the next attempt would be rejected anyway
+                   if breaker is not None and breaker.state == "open":
+                       print("[ERROR] Circuit opened. Operation failed.")
+                       metrics.record(failures=1)
+                       raise
+                   if budget is not None and not budget.try_acquire():
+                       print("[ERROR] Retry budget exhausted. Operation failed.")
+                       metrics.record(budget_exhausted=1, failures=1)
                        raise
-                   time.sleep(delay)
+                   sleep_for = compute_delay(attempt, delay, max_delay, backoff, jitter, sleep_for)
+                   metrics.record(retries=1, time_retrying=sleep_for)
+                   time.sleep(sleep_for)
+               else:
+                   if breaker is not None:
+                       breaker.record_success()
+                   return result
        return wrapper
    return decorator
 
@@ -43,6 +222,8 @@ def fetch_users_with_retry(conn):
    return cursor.fetchall()
 
 
-# ✅ Attempt to fetch users with retry
-users = fetch_users_with_retry()
-print(users)
+if __name__ == "__main__":
+   # ✅ Attempt to fetch users with retry
+   users = fetch_users_with_retry()
+   print(users)
+   print(retry_metrics.snapshot())
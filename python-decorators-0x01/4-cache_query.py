@@ -1,6 +1,8 @@
 import sqlite3
 import functools
 
+import query_metrics
+
 
 # Cache dictionary
 query_cache = {}
@@ -10,9 +12,9 @@ query_cache = {}
 def with_db_connection(func):
    @functools.wraps(func)
    def wrapper(*args, **kwargs):
-       conn = sqlite3.connect('users.db')
+       conn, handle = query_metrics.connect(lambda: sqlite3.connect('users.db'), func.__qualname__)
        try:
-           return func(conn, *args, **kwargs)
+           return func(handle, *args, **kwargs)
        finally:
            conn.close()
    return wrapper
@@ -23,8 +25,12 @@ def cache_query(func):
    @functools.wraps(func)
    def wrapper(conn, query, *args, **kwargs):
        if query in query_cache:
+           if query_metrics.enabled:
+               query_metrics.record_cache(query, hit=True)
            print("[CACHE HIT] Returning cached result for query.")
            return query_cache[query]
+       if query_metrics.enabled:
+           query_metrics.record_cache(query, hit=False)
        print("[CACHE MISS] Executing query and caching result.")
        result = func(conn, query, *args, **kwargs)
        query_cache[query] = result
@@ -40,9 +46,9 @@ def fetch_users_with_cache(conn, query):
    return cursor.fetchall()
 
 
-# ✅ First call - cache miss
-users = fetch_users_with_cache(query="SELECT * FROM users")
-
+if __name__ == "__main__":
+   # ✅ First call - cache miss
+   users = fetch_users_with_cache(query="SELECT * FROM users")
 
-# ✅ Second call - cache hit
-users_again = fetch_users_with_cache(query="SELECT * FROM users")
+   # ✅ Second call - cache hit
+   users_again = fetch_users_with_cache(query="SELECT * FROM users")
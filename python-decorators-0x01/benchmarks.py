@@ -0,0 +1,99 @@
+import os
+import time
+import sqlite3
+import argparse
+import tempfile
+
+
+def seed_users(db_name, count):
+   """Create a `users` table in `db_name` holding `count` synthetic rows."""
+   conn = sqlite3.connect(db_name)
+   try:
+       conn.execute("DROP TABLE IF EXISTS users")
+       conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, email TEXT, age INTEGER)")
+       conn.executemany(
+           "INSERT INTO users (id, name, email, age) VALUES (?, ?, ?, ?)",
+           ((i, f"user{i}", f"user{i}@example.com", 18 + i % 60) for i in range(1, count + 1)),
+       )
+       conn.commit()
+   finally:
+       conn.close()
+
+
+def timed(label, calls, func):
+   start = time.perf_counter()
+   for i in range(calls):
+       func(i)
+   elapsed = time.perf_counter() - start
+   print(f"{label:<40} {elapsed / calls * 1e6:>10.2f} us/call  ({calls} calls)")
+   return elapsed
+
+
+def bench_statement_cache(db_name, calls, rows):
+   """Per-call latency of get_user_by_id with and without connection reuse."""
+   module = __import__("1-with_db_connection")
+   query = "SELECT * FROM users WHERE id = ?"
+
+   @module.with_db_connection(db_name=db_name)
+   def fresh(conn, user_id):
+       cursor = conn.cursor()
+       cursor.execute(query, (user_id,))
+       return cursor.fetchone()
+
+   @module.with_db_connection(db_name=db_name, reuse=True)
+   def reused(conn, user_id):
+       cursor = conn.cursor()
+       cursor.execute(query, (user_id,))
+       return cursor.fetchone()
+
+   timed("new connection per call", calls, lambda i: fresh(i % rows + 1))
+   timed("reused connection + statement cache", calls, lambda i: reused(i % rows + 1))
+   module.close_cached_connections()
+
+
+def bench_group_commit(db_name, calls, rows):
+   """Throughput of bulk email updates, one commit per call vs batched."""
+   module = __import__("2-transactional")
+   calls = min(calls, rows)
+
+   def run(label, batch=None):
+       start = time.perf_counter()
+       for i in range(1, calls + 1):
+           module.update_user_email(user_id=i, new_email=f"{label}{i}@example.com")
+       if batch is not None:
+           batch.flush()
+       elapsed = time.perf_counter() - start
+       print(f"{label:<40} {calls / elapsed:>10.0f} updates/s  ({calls} updates)")
+
+   run("commit per call")
+   for size in (10, 100, 1000):
+       with module.batch_transaction(db_name, max_statements=size) as batch:
+           run(f"batch of {size}", batch)
+
+
+BENCHMARKS = {
+   "statement-cache": bench_statement_cache,
+   "group-commit": bench_group_commit,
+}
+
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Benchmarks for the DB decorators.")
+   parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+   parser.add_argument("--calls", type=int, default=10000)
+   parser.add_argument("--rows", type=int, default=1000)
+   args = parser.parse_args(argv)
+
+   # ✅ Decorators without a db_name argument open 'users.db' relative to the cwd
+   cwd = os.getcwd()
+   with tempfile.TemporaryDirectory() as tmp:
+       os.chdir(tmp)
+       try:
+           seed_users("users.db", args.rows)
+           BENCHMARKS[args.benchmark]("users.db", args.calls, args.rows)
+       finally:
+           os.chdir(cwd)
+
+
+if __name__ == "__main__":
+   main()
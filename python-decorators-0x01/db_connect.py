@@ -0,0 +1,61 @@
+import sqlite3
+
+
+# ✅ PRAGMA presets for the decorators' connections, applied in order on every new connection
+PROFILES = {
+   "default": {},
+   "durable": {
+       "journal_mode": "WAL",
+       "synchronous": "FULL",
+       "busy_timeout": 5000,
+   },
+   "balanced": {
+       "journal_mode": "WAL",
+       "synchronous": "NORMAL",
+       "cache_size": -65536,
+       "temp_store": "MEMORY",
+       "busy_timeout": 5000,
+   },
+   "fast": {
+       "journal_mode": "WAL",
+       "synchronous": "OFF",
+       "cache_size": -262144,
+       "temp_store": "MEMORY",
+       "busy_timeout": 10000,
+   },
+}
+
+
+def resolve_profile(profile):
+   """Return the PRAGMA mapping for a preset name, a mapping, or None."""
+   if profile is None:
+       return {}
+   if isinstance(profile, str):
+       try:
+           return PROFILES[profile]
+       except KeyError:
+           raise ValueError(f"Unknown connection profile: {profile!r}") from None
+   return dict(profile)
+
+
+def apply_profile(conn, profile):
+   """Run `PRAGMA name = value` for each setting of `profile` on `conn`."""
+   for pragma, value in resolve_profile(profile).items():
+       if not pragma.isidentifier():
+           raise ValueError(f"Invalid pragma name: {pragma!r}")
+       if not isinstance(value, int) and not str(value).isidentifier():
+           raise ValueError(f"Invalid value for pragma {pragma}: {value!r}")
+       conn.execute(f"PRAGMA {pragma} = {value}")
+   return conn
+
+
+def connect(db_name, profile=None, **kwargs):
+   """sqlite3.connect() followed by apply_profile()."""
+   return apply_profile(sqlite3.connect(db_name, **kwargs), profile)
+
+
+def profile_key(profile):
+   """Hashable form of `profile`, for caching connections per profile."""
+   if profile is None or isinstance(profile, str):
+       return profile
+   return tuple(sorted(profile.items()))
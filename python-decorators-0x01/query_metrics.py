@@ -0,0 +1,225 @@
+import time
+import threading
+
+from query_utils import fingerprint, normalize_query
+
+
+# ✅ Off by default: decorators check this flag and skip all bookkeeping
+enabled = False
+
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PHASES = ("connect", "execute", "fetch")
+
+_lock = threading.Lock()
+_histograms = {}
+_queries = {}
+_cache = {}
+
+
+def enable():
+   global enabled
+   enabled = True
+
+
+def disable():
+   global enabled
+   enabled = False
+
+
+def reset():
+   with _lock:
+       _histograms.clear()
+       _queries.clear()
+       _cache.clear()
+
+
+class Histogram:
+   """Cumulative latency histogram in seconds, Prometheus style."""
+
+   def __init__(self, buckets=BUCKETS):
+       self.buckets = buckets
+       self.counts = [0] * (len(buckets) + 1)
+       self.total = 0.0
+       self.count = 0
+
+   def observe(self, seconds):
+       index = 0
+       for index, bound in enumerate(self.buckets):
+           if seconds <= bound:
+               break
+       else:
+           index = len(self.buckets)
+       self.counts[index] += 1
+       self.total += seconds
+       self.count += 1
+
+   def quantile(self, q):
+       """Estimate quantile `q` as the upper bound of the bucket holding it."""
+       if not self.count:
+           return 0.0
+       target = q * self.count
+       seen = 0
+       for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+           seen += count
+           if seen >= target:
+               return bound
+       return float("inf")
+
+
+def observe(phase, key, seconds):
+   """Record `seconds` spent in `phase` for a query fingerprint or function."""
+   with _lock:
+       histogram = _histograms.get((phase, key))
+       if histogram is None:
+           histogram = _histograms[(phase, key)] = Histogram()
+       histogram.observe(seconds)
+
+
+def record_cache(query, hit):
+   key = fingerprint(query)
+   with _lock:
+       _queries.setdefault(key, normalize_query(query))
+       hits, misses = _cache.get(key, (0, 0))
+       _cache[key] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+
+def cache_hit_ratio():
+   with _lock:
+       hits = sum(h for h, _ in _cache.values())
+       misses = sum(m for _, m in _cache.values())
+   total = hits + misses
+   return hits / total if total else 0.0
+
+
+class InstrumentedCursor:
+   """Cursor proxy timing execute and fetch calls per query fingerprint."""
+
+   def __init__(self, cursor):
+       self._cursor = cursor
+       self._key = None
+
+   def execute(self, query, *args):
+       self._key = fingerprint(query)
+       with _lock:
+           _queries.setdefault(self._key, normalize_query(query))
+       start = time.perf_counter()
+       self._cursor.execute(query, *args)
+       observe("execute", self._key, time.perf_counter() - start)
+       return self
+
+   def _timed_fetch(self, method, *args):
+       start = time.perf_counter()
+       rows = getattr(self._cursor, method)(*args)
+       observe("fetch", self._key, time.perf_counter() - start)
+       return rows
+
+   def fetchone(self):
+       return self._timed_fetch("fetchone")
+
+   def fetchmany(self, *args):
+       return self._timed_fetch("fetchmany", *args)
+
+   def fetchall(self):
+       return self._timed_fetch("fetchall")
+
+   def __iter__(self):
+       return iter(self._cursor)
+
+   def __getattr__(self, name):
+       return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+   """Connection proxy whose cursors are instrumented."""
+
+   def __init__(self, connection):
+       self._connection = connection
+
+   def cursor(self, *args, **kwargs):
+       return InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+
+   def execute(self, query, *args):
+       return self.cursor().execute(query, *args)
+
+   def __getattr__(self, name):
+       return getattr(self._connection, name)
+
+
+def connect(connect_fn, label):
+   """Open a connection via `connect_fn`, timing it under `label`.
+
+   Returns `(raw_connection, connection_to_hand_out)`; the caller closes the
+   raw connection. When metrics are disabled both are the same object.
+   """
+   if not enabled:
+       conn = connect_fn()
+       return conn, conn
+   start = time.perf_counter()
+   conn = connect_fn()
+   observe("connect", label, time.perf_counter() - start)
+   return conn, InstrumentedConnection(conn)
+
+
+def _escape(value):
+   return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def to_prometheus():
+   """Render all metrics in the Prometheus text exposition format."""
+   lines = []
+   with _lock:
+       histograms = sorted(_histograms.items())
+       queries = dict(_queries)
+       cache = sorted(_cache.items())
+   for phase in PHASES:
+       name = f"db_query_{phase}_seconds"
+       label = "function" if phase == "connect" else "fingerprint"
+       lines.append(f"# HELP {name} Time spent in the {phase} phase.")
+       lines.append(f"# TYPE {name} histogram")
+       for (hist_phase, key), histogram in histograms:
+           if hist_phase != phase:
+               continue
+           labels = f'{label}="{_escape(key)}"'
+           if key in queries:
+               labels += f',query="{_escape(queries[key])}"'
+           cumulative = 0
+           for bound, count in zip(histogram.buckets, histogram.counts):
+               cumulative += count
+               lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+           lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+           lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+           lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+   lines.append("# HELP db_query_cache_requests_total Query cache lookups by result.")
+   lines.append("# TYPE db_query_cache_requests_total counter")
+   for key, (hits, misses) in cache:
+       lines.append(f'db_query_cache_requests_total{{fingerprint="{key}",result="hit"}} {hits}')
+       lines.append(f'db_query_cache_requests_total{{fingerprint="{key}",result="miss"}} {misses}')
+   return "\n".join(lines) + "\n"
+
+
+def report():
+   """Return a human readable summary, slowest total execute time first."""
+   with _lock:
+       histograms = dict(_histograms)
+       queries = dict(_queries)
+       cache = dict(_cache)
+   keys = sorted(
+       {key for phase, key in histograms if phase != "connect"} | set(cache),
+       key=lambda k: -histograms.get(("execute", k), Histogram()).total,
+   )
+   lines = [f"{'fingerprint':<16} {'calls':>7} {'exec p50':>9} {'exec p99':>9} "
+            f"{'fetch p99':>9} {'total s':>9} {'hit %':>6}  query"]
+   for key in keys:
+       execute = histograms.get(("execute", key), Histogram())
+       fetch = histograms.get(("fetch", key), Histogram())
+       hits, misses = cache.get(key, (0, 0))
+       ratio = f"{100 * hits / (hits + misses):.0f}" if hits + misses else "-"
+       lines.append(f"{key:<16} {execute.count:>7} {execute.quantile(0.5):>9} "
+                    f"{execute.quantile(0.99):>9} {fetch.quantile(0.99):>9} "
+                    f"{execute.total + fetch.total:>9.4f} {ratio:>6}  {queries.get(key, '')}")
+   connects = [(k, h) for (phase, k), h in histograms.items() if phase == "connect"]
+   for label, histogram in sorted(connects):
+       lines.append(f"connect {label}: {histogram.count} calls, "
+                    f"{histogram.total / histogram.count * 1000:.3f} ms avg")
+   lines.append(f"cache hit ratio: {cache_hit_ratio():.2%}")
+   return "\n".join(lines)
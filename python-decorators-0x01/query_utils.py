@@ -0,0 +1,22 @@
+import re
+import hashlib
+
+
+# ✅ Literals and whitespace stripped so "id = 1" and "id = 2" share a fingerprint
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bin\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+   """Return `query` with literals replaced by `?` and whitespace collapsed."""
+   query = _STRING_LITERAL.sub("?", query)
+   query = _NUMBER_LITERAL.sub("?", query)
+   query = _IN_LIST.sub("IN (...)", query)
+   return _WHITESPACE.sub(" ", query).strip()
+
+
+def fingerprint(query):
+   """Return a short stable hash identifying the shape of `query`."""
+   return hashlib.sha1(normalize_query(query).encode()).hexdigest()[:16]
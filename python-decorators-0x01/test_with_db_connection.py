@@ -0,0 +1,42 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from benchmarks import seed_users
+
+with_db_connection = __import__("1-with_db_connection").with_db_connection
+close_cached_connections = __import__("1-with_db_connection").close_cached_connections
+
+
+class TestReusedConnection(unittest.TestCase):
+   """with_db_connection(reuse=True) must not hold locks between calls."""
+
+   def setUp(self):
+       self.tmp = tempfile.TemporaryDirectory()
+       self.db_name = os.path.join(self.tmp.name, "users.db")
+       seed_users(self.db_name, 10)
+
+   def tearDown(self):
+       close_cached_connections()
+       self.tmp.cleanup()
+
+   def test_partial_fetch_releases_read_lock(self):
+       @with_db_connection(db_name=self.db_name, reuse=True)
+       def first_adult(conn):
+           cursor = conn.cursor()
+           cursor.execute("SELECT * FROM users WHERE age > 18")
+           return cursor.fetchone()
+
+       self.assertIsNotNone(first_adult())
+
+       writer = sqlite3.connect(self.db_name, timeout=0)
+       try:
+           writer.execute("UPDATE users SET age = age + 1")
+           writer.commit()
+       finally:
+           writer.close()
+
+
+if __name__ == "__main__":
+   unittest.main()